@@ -0,0 +1,40 @@
+"""keyset indexes for remaining admin lists
+
+Revision ID: a4c92d85e1b7
+Revises: f1d7842e9c35
+Create Date: 2026-09-01 16:28:41.507212
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c92d85e1b7'
+down_revision: Union[str, Sequence[str], None] = 'f1d7842e9c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Admin list endpoints that page with (created_at, id) keyset seeks but were
+# missed by the first batch of composite indexes
+_TABLES = ('complaints', 'returns', 'reviews', 'rescue_contributions')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same shape as the products/orders/suppliers/supplier_orders composites:
+    # without it each page still sorts the whole table
+    for table in _TABLES:
+        op.create_index(
+            f'{table}_created_id_idx',
+            table,
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _TABLES:
+        op.drop_index(f'{table}_created_id_idx', table_name=table)
@@ -0,0 +1,36 @@
+"""index orders by user for order history
+
+Revision ID: a8d27c5e94f1
+Revises: f3e96b08d215
+Create Date: 2026-09-01 15:41:02.195627
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d27c5e94f1'
+down_revision: Union[str, Sequence[str], None] = 'f3e96b08d215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # "Give me my orders" filters on user_id and sorts by the keyset cursor;
+    # this index serves both in one seek instead of filtering the
+    # (created_at, id) index or scanning the heap. Wishlist and cart need
+    # nothing: their (user_id, product_id) primary keys already lead on
+    # user_id.
+    op.create_index(
+        'ix_orders_user_id_created_id', 'orders',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_user_id_created_id', table_name='orders')
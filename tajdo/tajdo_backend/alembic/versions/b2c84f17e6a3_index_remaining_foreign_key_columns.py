@@ -0,0 +1,56 @@
+"""index remaining foreign key columns
+
+Revision ID: b2c84f17e6a3
+Revises: a8d27c5e94f1
+Create Date: 2026-09-01 16:05:33.871420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2c84f17e6a3'
+down_revision: Union[str, Sequence[str], None] = 'a8d27c5e94f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres never auto-indexes FK columns, so each of these still forced a
+# child-table scan on relationship loads and cascade deletes. This sweep
+# covers every FK the earlier index migrations didn't: the big one is
+# order_items.order_id, which every Order.items selectinload filters on.
+# product_suppliers gets a supplier_id index because its composite PK leads
+# on product_id and so can't serve supplier-side lookups.
+_INDEXES = (
+    ('ix_product_suppliers_supplier_id', 'product_suppliers', ['supplier_id']),
+    ('ix_product_specifications_product_id', 'product_specifications', ['product_id']),
+    ('ix_product_images_product_id', 'product_images', ['product_id']),
+    ('ix_products_category_id', 'products', ['category_id']),
+    ('ix_orders_shipping_address_id', 'orders', ['shipping_address_id']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_status_history_order_id', 'order_status_history', ['order_id']),
+    ('ix_notifications_order_id', 'notifications', ['order_id']),
+    ('ix_supplier_orders_supplier_id', 'supplier_orders', ['supplier_id']),
+    ('ix_supplier_orders_customer_order_id', 'supplier_orders', ['customer_order_id']),
+    ('ix_supplier_payments_supplier_order_id', 'supplier_payments', ['supplier_order_id']),
+    ('ix_complaints_order_id', 'complaints', ['order_id']),
+    ('ix_returns_order_id', 'returns', ['order_id']),
+    ('ix_reviews_user_id', 'reviews', ['user_id']),
+    ('ix_rescue_contributions_order_id', 'rescue_contributions', ['order_id']),
+    ('ix_bookings_user_id', 'bookings', ['user_id']),
+    ('ix_bookings_service_id', 'bookings', ['service_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""add lower(email) lookup index for users
+
+Revision ID: b7c41d52a9e0
+Revises: e81b44098472
+Create Date: 2026-09-01 10:12:48.104226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41d52a9e0'
+down_revision: Union[str, Sequence[str], None] = 'e81b44098472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Logins and the admin promote/demote/reset flows all filter on
+    # lower(users.email); the plain UNIQUE(email) index can't serve that
+    # expression, so every lookup was a sequential scan. The other hot WHERE
+    # clauses in main.py are already covered: wishlists and cart_items have
+    # composite (user_id, product_id) primary keys and orders.order_number
+    # carries a UNIQUE constraint from the initial tables migration.
+    op.create_index(
+        'users_email_lower_uidx',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('users_email_lower_uidx', table_name='users')
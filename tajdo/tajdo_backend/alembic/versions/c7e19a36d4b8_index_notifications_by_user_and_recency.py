@@ -0,0 +1,38 @@
+"""index notifications by user and recency
+
+Revision ID: c7e19a36d4b8
+Revises: b2c84f17e6a3
+Create Date: 2026-09-01 16:22:48.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e19a36d4b8'
+down_revision: Union[str, Sequence[str], None] = 'b2c84f17e6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The notification feed is "latest rows for a user"; with only the
+    # single-column user_id index the planner still sorts after the scan.
+    # This composite serves filter and order in one seek, mirroring
+    # ix_orders_user_id_created_id on orders. The plain user_id index it
+    # obsoletes is dropped.
+    op.create_index(
+        'ix_notifications_user_id_created_id', 'notifications',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.drop_index('ix_notifications_user_id', table_name='notifications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_notifications_user_id', 'notifications', ['user_id'])
+    op.drop_index('ix_notifications_user_id_created_id', table_name='notifications')
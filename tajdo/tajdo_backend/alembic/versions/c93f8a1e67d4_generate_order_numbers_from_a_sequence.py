@@ -0,0 +1,38 @@
+"""generate order numbers from a sequence
+
+Revision ID: c93f8a1e67d4
+Revises: b7c41d52a9e0
+Create Date: 2026-09-01 11:03:27.558190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c93f8a1e67d4'
+down_revision: Union[str, Sequence[str], None] = 'b7c41d52a9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Order numbers were minted in Python from uuid4().hex[:6], which can
+    # collide and then fails the whole checkout on the unique constraint.
+    # A sequence formatted server-side is collision-free, monotonic (better
+    # index locality) and filled in by the INSERT itself. Existing rows keep
+    # their uuid-derived numbers; the hex formats are indistinguishable.
+    op.execute("CREATE SEQUENCE order_number_seq")
+    op.alter_column(
+        'orders', 'order_number',
+        server_default=sa.text("'ORD-' || lpad(upper(to_hex(nextval('order_number_seq'))), 6, '0')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('orders', 'order_number', server_default=None)
+    op.execute("DROP SEQUENCE order_number_seq")
@@ -0,0 +1,39 @@
+"""add keyset pagination indexes
+
+Revision ID: d41b9c25f8a7
+Revises: c93f8a1e67d4
+Create Date: 2026-09-01 11:41:09.873315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41b9c25f8a7'
+down_revision: Union[str, Sequence[str], None] = 'c93f8a1e67d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose list endpoints page with (created_at, id) keyset seeks
+_TABLES = ('products', 'orders', 'suppliers', 'supplier_orders')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs the ORDER BY created_at DESC, id DESC seek in the paginated list
+    # endpoints so each page is an index range scan, not a sort
+    for table in _TABLES:
+        op.create_index(
+            f'{table}_created_id_idx',
+            table,
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _TABLES:
+        op.drop_index(f'{table}_created_id_idx', table_name=table)
@@ -0,0 +1,40 @@
+"""partial indexes for payment analytics
+
+Revision ID: d6b03e58f2c7
+Revises: c7e19a36d4b8
+Create Date: 2026-09-01 16:58:24.711059
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6b03e58f2c7'
+down_revision: Union[str, Sequence[str], None] = 'c7e19a36d4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The admin payment dashboards all run
+    #   WHERE payment_method = ? AND status <> 'pending_payment'
+    #   ORDER BY created_at DESC
+    # for both the transaction lists and the SUM(total) balances. A partial
+    # index per method covers exactly those rows, sorted, with total INCLUDEd
+    # so the balance query is index-only; unpaid orders never enter it.
+    for method in ('twint', 'card'):
+        op.execute(
+            f"CREATE INDEX ix_orders_{method}_confirmed "
+            f"ON orders (created_at DESC) INCLUDE (total) "
+            f"WHERE payment_method = '{method}' AND status <> 'pending_payment'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for method in ('card', 'twint'):
+        op.drop_index(f'ix_orders_{method}_confirmed', table_name='orders')
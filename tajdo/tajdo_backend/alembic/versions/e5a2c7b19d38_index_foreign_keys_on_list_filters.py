@@ -0,0 +1,45 @@
+"""index foreign keys used by list filters
+
+Revision ID: e5a2c7b19d38
+Revises: d41b9c25f8a7
+Create Date: 2026-09-01 13:24:51.662478
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c7b19d38'
+down_revision: Union[str, Sequence[str], None] = 'd41b9c25f8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) — every list endpoint filters on one of these
+# foreign keys; Postgres does not index FK columns automatically, so each of
+# these was a sequential scan. The (fk, id) composites also let keyset
+# pagination run as an index-only seek.
+_INDEXES = (
+    ('ix_reviews_product_id', 'reviews', ['product_id', 'id']),
+    ('ix_complaints_user_id', 'complaints', ['user_id', 'id']),
+    ('ix_returns_user_id', 'returns', ['user_id', 'id']),
+    ('ix_supplier_payments_supplier_id', 'supplier_payments', ['supplier_id']),
+    ('ix_supplier_order_items_supplier_order_id', 'supplier_order_items', ['supplier_order_id']),
+    ('ix_order_items_product_id_order_id', 'order_items', ['product_id', 'order_id']),
+    ('ix_notifications_user_id', 'notifications', ['user_id']),
+    ('ix_addresses_user_id', 'addresses', ['user_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,50 @@
+"""maintain updated_at with a trigger
+
+Revision ID: f1d7842e9c35
+Revises: e9a45c21b7d6
+Create Date: 2026-09-01 17:29:41.053118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d7842e9c35'
+down_revision: Union[str, Sequence[str], None] = 'e9a45c21b7d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every table carrying an updated_at column. The ORM's onupdate=func.now()
+# only fired for ORM-flushed updates and appended SET updated_at = now() to
+# each statement; the trigger touches the column for any UPDATE, including
+# Core bulk updates, at DB commit time.
+_TABLES = ('users', 'products', 'orders', 'complaints', 'returns')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in _TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_touch_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION touch_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_TABLES):
+        op.execute(f"DROP TRIGGER {table}_touch_updated_at ON {table}")
+    op.execute("DROP FUNCTION touch_updated_at()")
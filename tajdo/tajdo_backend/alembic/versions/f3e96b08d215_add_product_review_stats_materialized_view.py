@@ -0,0 +1,45 @@
+"""add product review stats materialized view
+
+Revision ID: f3e96b08d215
+Revises: e5a2c7b19d38
+Create Date: 2026-09-01 15:02:17.408233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3e96b08d215'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c7b19d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Aggregating ratings on every product page load re-scans reviews each
+    # time; the materialized view computes the rollup once and readers get a
+    # single-row index lookup. The unique index is also what lets
+    # REFRESH ... CONCURRENTLY run without blocking those reads.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW product_review_stats AS
+        SELECT product_id,
+               count(*)    AS review_count,
+               avg(rating) AS avg_rating
+        FROM reviews
+        GROUP BY product_id
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX product_review_stats_product_id_uidx "
+        "ON product_review_stats (product_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW product_review_stats")
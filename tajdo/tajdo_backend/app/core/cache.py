@@ -0,0 +1,44 @@
+import threading
+
+from cachetools import TTLCache
+
+
+class ResponseCache:
+    """Read-through cache for hot public GET endpoints.
+
+    Catalog data mutates rarely (admin only) but is read on every storefront
+    page load, so serving it from process memory skips the SQL round trip
+    entirely. Writers call invalidate() after committing; entries also age
+    out on their own, so a missed invalidation self-heals within one TTL.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when no key is given.
+
+        List endpoints are keyed by pagination window, so writers that can't
+        enumerate affected keys just clear the whole cache — it's in-process
+        memory, so a full clear is cheap and always correct.
+        """
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+
+product_cache = ResponseCache(maxsize=2048, ttl=300)
+category_cache = ResponseCache(maxsize=128, ttl=300)
+review_cache = ResponseCache(maxsize=2048, ttl=120)
+rescue_cache = ResponseCache(maxsize=256, ttl=60)
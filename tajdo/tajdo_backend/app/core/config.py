@@ -1,23 +1,50 @@
+from functools import lru_cache
 from typing import List
-import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-class Settings:
+
+class Settings(BaseSettings):
     PROJECT_NAME: str = "Tajdo Online Store API"
     # CORS Origins
     # Load from env or default to localhost
-    FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
-    _ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:8080,http://localhost:5173,http://localhost:3000,https://www.tajdo.shop,https://tadjo-frontend-draft.vercel.app,https://tadjo-frontend-draft-49zx.vercel.app,http://localhost:8080")
-    BACKEND_CORS_ORIGINS: List[str] = [origin.strip() for origin in _ALLOWED_ORIGINS.split(",") if origin.strip()]
+    FRONTEND_URL: str = "http://localhost:5173"
+    ALLOWED_ORIGINS: str = "http://localhost:8080,http://localhost:5173,http://localhost:3000,https://www.tajdo.shop,https://tadjo-frontend-draft.vercel.app,https://tadjo-frontend-draft-49zx.vercel.app,http://localhost:8080"
 
     # TWINT Listener Settings
-    IMAP_SERVER: str = os.getenv("IMAP_SERVER", "imap.gmail.com")
-    IMAP_PORT: int = int(os.getenv("IMAP_PORT", "143"))
-    TWINT_EMAIL_USER: str = os.getenv("TWINT_EMAIL_USER", "")
-    TWINT_EMAIL_PASSWORD: str = os.getenv("TWINT_EMAIL_PASSWORD", "")
-
-    STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
-    
-settings = Settings()
+    IMAP_SERVER: str = "imap.gmail.com"
+    IMAP_PORT: int = 143
+    TWINT_EMAIL_USER: str = ""
+    TWINT_EMAIL_PASSWORD: str = ""
+
+    STRIPE_SECRET_KEY: str = ""
+
+    # JWT signing
+    SECRET_KEY: str = "super-secret-key"
+
+    # Password hashing cost (Argon2id). Defaults follow OWASP guidance; tune
+    # against the p99 login latency budget of the deploy target.
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_PARALLELISM: int = 1
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    @property
+    def BACKEND_CORS_ORIGINS(self) -> List[str]:
+        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",") if origin.strip()]
+
+    # Frozen set view of the same origins so membership checks are O(1) hash
+    # lookups instead of linear scans of the list.
+    @property
+    def BACKEND_CORS_ORIGIN_SET(self) -> frozenset:
+        return frozenset(self.BACKEND_CORS_ORIGINS)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse settings from the environment/.env exactly once per process."""
+    return Settings()
+
+
+settings = get_settings()
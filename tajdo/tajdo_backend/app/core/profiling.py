@@ -0,0 +1,35 @@
+import contextvars
+
+from sqlalchemy import event
+
+# Per-request SQL statement count, carried on a contextvar so concurrent
+# requests (threadpool or event loop) don't mix their tallies.
+_query_count: contextvars.ContextVar = contextvars.ContextVar("query_count", default=None)
+
+
+def install_query_counter(app, engine):
+    """Dev-only visibility into per-request query counts.
+
+    Attaches a cursor-execute listener plus middleware that stamps every
+    response with an X-Query-Count header. A number that grows with list
+    length is an N+1 — fix the loader options before it ships. Enabled by
+    setting DEV_QUERY_COUNT; never run in production, the listener taxes
+    every statement.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        count = _query_count.get()
+        if count is not None:
+            count.append(statement)
+
+    @app.middleware("http")
+    async def _query_count_header(request, call_next):
+        queries = []
+        token = _query_count.set(queries)
+        try:
+            response = await call_next(request)
+        finally:
+            _query_count.reset(token)
+        response.headers["X-Query-Count"] = str(len(queries))
+        return response
@@ -0,0 +1,39 @@
+import threading
+
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+
+
+def rate_limiter(scope: str, limit: int, window: int = 60):
+    """Fixed-window request limiter, used as a FastAPI dependency.
+
+    Counts requests per client IP per window for unauthenticated endpoints
+    that would otherwise be enumeration oracles (login, order tracking).
+    Windows live in a TTLCache so stale buckets evict themselves; like the
+    other caches in this app the state is per-process, which is the right
+    scope for this single-service deployment.
+    """
+    buckets = TTLCache(maxsize=100000, ttl=window)
+    lock = threading.Lock()
+
+    def dependency(request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+        key = (scope, client_ip)
+        with lock:
+            # Insert the bucket once per window and mutate it in place:
+            # assigning through buckets[key] would reset the entry's TTL on
+            # every request, turning the fixed window into a sliding one that
+            # never expires for a steadily-sending client
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = bucket = [0]
+            bucket[0] += 1
+            count = bucket[0]
+        if count > limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later.",
+                headers={"Retry-After": str(window)},
+            )
+
+    return dependency
@@ -1,44 +1,146 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 
-from jose import JWTError, jwt
+import jwt
+import orjson
+from jwt import InvalidTokenError as JWTError
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cachetools import TTLCache
 
-from dotenv import load_dotenv
+import asyncio
+import base64
+import concurrent.futures
 import os
+import hmac
 import hashlib
+import threading
+import time
 
-load_dotenv()
+from .config import settings
 
-SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
+SECRET_KEY = settings.SECRET_KEY
+# Pre-encoded once; PyJWT and hmac both take bytes, so no str.encode per call
+SECRET_KEY_BYTES = SECRET_KEY.encode('utf-8')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Cache of already-verified token payloads so repeat requests with the same
+# bearer token skip signature verification. Entries live at most one token
+# lifetime; the stored 'exp' claim is still checked on every hit.
+_decoded_token_cache = TTLCache(maxsize=10000, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_decoded_token_cache_lock = threading.Lock()
+
+def _token_cache_key(token: str) -> bytes:
+    # Hash the token so the cache holds fixed-size keys instead of full JWTs
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+# Cost parameters come from Settings so operators can tune them to the login
+# latency budget without a code change
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Well-formed bcrypt hash that never matches real input; verified against
+# when a stored hash is structurally invalid so the reject path costs the
+# same as a genuine failed verify (no timing oracle for broken accounts).
+_DUMMY_BCRYPT_HASH = b"$2b$12$N9qo8uLOickgx2ZMRZoMyeIjZAgcfl7p92ldGxad68LJZdL17lhWy"
+
 def verify_password(plain_password, hashed_password):
-    # Pre-hash to ensure consistent length
-    hashed_input = hashlib.sha256(plain_password.encode('utf-8')).hexdigest().encode('utf-8')
-    # bcrypt.checkpw requires bytes
-    return bcrypt.checkpw(hashed_input, hashed_password.encode('utf-8'))
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    if hashed_password.startswith("$argon2"):
+        try:
+            return ph.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    # Legacy bcrypt hashes (sha256 pre-hash to dodge bcrypt's 72-byte limit).
+    # Kept for verification only; new hashes are Argon2id. The hex form of the
+    # pre-hash is frozen by the hashes already stored in the database, so the
+    # raw digest cannot be fed to bcrypt directly.
+    key = hashlib.sha256(plain_password.encode('utf-8')).hexdigest().encode('ascii')
+    if len(hashed_password) != 60 or not hashed_password.startswith(("$2a$", "$2b$", "$2y$")):
+        # Empty/garbage hash (e.g. NULL column): fail closed, but still burn
+        # a full bcrypt verify so this path is timing-equivalent
+        bcrypt.checkpw(key, _DUMMY_BCRYPT_HASH)
+        return False
+    return bcrypt.checkpw(key, hashed_password.encode('ascii'))
 
 def get_password_hash(password):
-    # Pre-hash to ensure consistent length
-    hashed_input = hashlib.sha256(password.encode('utf-8')).hexdigest().encode('utf-8')
-    # bcrypt.hashpw returns bytes, we decode to store as string
-    return bcrypt.hashpw(hashed_input, bcrypt.gensalt()).decode('utf-8')
+    # Argon2id has no input length cap, so no pre-hash is needed
+    return ph.hash(password)
+
+def password_needs_rehash(hashed_password) -> bool:
+    """True when a stored hash predates the current Argon2id scheme or was
+    minted under older cost parameters."""
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return ph.check_needs_rehash(hashed_password)
+
+# Dedicated pool for KDF work, sized to the CPUs actually available. Keeping
+# hashing out of the shared request threadpool means a burst of logins can't
+# starve ordinary endpoints of workers, and argon2-cffi releases the GIL in C
+# so the hashes genuinely run in parallel.
+_hash_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 2, thread_name_prefix="pwhash"
+)
+
+# Async wrappers for use inside async def endpoints: the KDF runs for tens of
+# milliseconds, so it belongs on a worker thread, not the event loop.
+async def verify_password_async(plain_password, hashed_password):
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, verify_password, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password):
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, get_password_hash, password)
+
+# Every token this service mints uses the same HS256 header and key, so both
+# are prepared once at import; per token only the payload segment and the
+# final HMAC vary. Tokens stay standard JWTs and verify with jwt.decode.
+_JWS_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
+_DEFAULT_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
+    # exp is an int unix timestamp; no datetime arithmetic per token
+    # (datetime.utcnow is also deprecated as of Python 3.12)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expires_seconds = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+        expires_seconds = _DEFAULT_EXPIRE_SECONDS
+    to_encode.update({"exp": int(time.time()) + expires_seconds})
+    # orjson emits compact UTF-8 bytes directly, so no separators tuning or
+    # str.encode round-trip for the claims dict
+    payload_b64 = base64.urlsafe_b64encode(orjson.dumps(to_encode)).rstrip(b'=')
+    signing_input = _JWS_HEADER_B64 + b'.' + payload_b64
+    signature = base64.urlsafe_b64encode(
+        hmac.new(SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    ).rstrip(b'=')
+    return (signing_input + b'.' + signature).decode('ascii')
 
 def decode_access_token(token: str):
+    cache_key = _token_cache_key(token)
+    with _decoded_token_cache_lock:
+        payload = _decoded_token_cache.get(cache_key)
+    if payload is not None:
+        # Honour the token's own expiry even when the cache entry is younger
+        if payload.get("exp", 0) > time.time():
+            return payload
+        with _decoded_token_cache_lock:
+            _decoded_token_cache.pop(cache_key, None)
+        return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
     except JWTError:
+        # Never cache invalid tokens
         return None
+    with _decoded_token_cache_lock:
+        _decoded_token_cache[cache_key] = payload
+    return payload
@@ -9,12 +9,11 @@ from sqlalchemy.orm import Session
 from ..db.session import engine
 from ..models import models
 from ..core.config import settings
-from ..services.email_service import EmailService
+from ..services.email_service import email_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-email_service = EmailService()
 
 async def start_twint_listener():
     """Background task to check for TWINT payment emails periodically."""
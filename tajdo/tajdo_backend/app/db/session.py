@@ -17,10 +17,37 @@ if SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("postgres://")
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,  # Tests connections before using them
-    pool_recycle=300,    # Refreshes connections every 5 minutes
-    pool_size=10,        # Increases pool size for more concurrent requests
+    # Pool sizing is env-tunable so ops can match each environment's DB
+    # connection budget without a code change
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "300")),    # Refresh before the provider's idle timeout cuts us off
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),           # Steady-state connections held open across requests
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),     # Burst headroom before checkouts start queueing
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),     # Fail checkout loudly instead of queueing forever
+    # Compiled-SQL cache sized to hold every statement the app emits
+    # (endpoints x variants) so steady state never re-compiles a query
+    query_cache_size=1200,
+    # psycopg2-only: batch executemany calls (order items, status history)
+    # into multi-VALUES statements instead of one round trip per row
+    **(
+        {"executemany_mode": "values_plus_batch"}
+        if SQLALCHEMY_DATABASE_URL.startswith("postgresql")
+        else {}
+    ),
+)
+# expire_on_commit=False: objects keep their flushed state after commit, so
+# handlers can serialize what they just wrote without a reload SELECT. Each
+# session lives for exactly one request, so there's no window for the kept
+# attributes to go stale.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Read-only sessions run on AUTOCOMMIT connections from the same pool: no
+# BEGIN/COMMIT round trips around endpoints that only ever SELECT. Sessions
+# from this factory must never write.
+ReadOnlySessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -30,3 +57,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_db_ro():
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
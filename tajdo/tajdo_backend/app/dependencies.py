@@ -1,6 +1,9 @@
+import threading
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from cachetools import TTLCache
 
 from .db.session import get_db
 from .models import models
@@ -9,7 +12,20 @@ from .core.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Short-lived cache of authenticated users keyed by email so read-heavy
+# traffic doesn't pay a SQL round-trip on every request. Endpoints that
+# change a user's role or password call invalidate_user_cache(); everything
+# else tolerates up to 30s of staleness.
+_user_cache = TTLCache(maxsize=5000, ttl=30)
+_user_cache_lock = threading.Lock()
+
+def invalidate_user_cache(email: str):
+    with _user_cache_lock:
+        _user_cache.pop(email, None)
+
+# Deliberately a plain def: FastAPI resolves sync dependencies in its
+# threadpool, so the blocking DB round-trip never runs on the event loop.
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -21,12 +37,35 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == email).first()
+    with _user_cache_lock:
+        user = _user_cache.get(email)
+    if user is not None:
+        return user
+    # The email UNIQUE constraint (initial migration) already backs this with
+    # an index seek; load_only keeps password_hash/reset-token columns out of
+    # the per-request SELECT since auth never touches them.
+    user = db.query(models.User).options(load_only(
+        models.User.id, models.User.email, models.User.role,
+        models.User.full_name, models.User.phone, models.User.locale,
+        models.User.created_at, models.User.updated_at,
+    )).filter(models.User.email == email).first()
     if user is None:
         raise credentials_exception
+    with _user_cache_lock:
+        _user_cache[email] = user
     return user
 
-async def get_current_admin(current_user: schemas.User = Depends(get_current_user)):
+def get_current_admin(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    payload = decode_access_token(token)
+    # Tokens carry the role claim since login mints it; a non-admin token can
+    # be rejected here without resolving the user at all. Tokens minted
+    # before the claim existed fall through to the DB-backed check.
+    if payload is not None and payload.get("role", "admin") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges"
+        )
+    current_user = get_current_user(token=token, db=db)
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,8 +1,10 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, File, UploadFile, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert, literal, tuple_, select, bindparam, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
@@ -13,30 +15,91 @@ from datetime import datetime, timedelta, timezone
 # from .services.payment_service import process_twint_payment, process_card_payment
 import stripe
 
-from .db.session import engine, Base, get_db
+from .db.session import engine, Base, get_db, get_db_ro
 from .models import models
 from .schemas import schemas
 from .schemas.schemas import TwintTransactionSchema, CardTransactionSchema # Import the schemas
-from .core.security import verify_password, get_password_hash, create_access_token, decode_access_token
+from .core.security import (
+    verify_password, get_password_hash, create_access_token, decode_access_token,
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+)
 from .core.config import settings
-from .dependencies import get_current_user, get_current_admin
-from .services.email_service import EmailService
+from .dependencies import get_current_user, get_current_admin, invalidate_user_cache
+from .core.cache import product_cache, category_cache, review_cache, rescue_cache
+from .core.rate_limit import rate_limiter
+from fastapi.concurrency import run_in_threadpool
+from .services.email_service import email_service
 from app.routers import payments
 from .core.twint_listener import start_twint_listener, check_emails
 import asyncio
+import hashlib
+import hmac
+import logging
+import orjson
 from fastapi.staticfiles import StaticFiles
 from PIL import Image
-from sqlalchemy.orm import joinedload # Import joinedload for eager loading
+from sqlalchemy.orm import joinedload, selectinload, contains_eager # Eager loading for list endpoints
 import io
 
 
-email_service = EmailService()
+
+def _keyset_page(query, model, after, db):
+    """Apply (created_at, id) keyset pagination to a list query.
+
+    OFFSET makes page N cost O(N) because Postgres scans and discards the
+    skipped rows; seeking past an anchor row keeps every page constant-cost.
+    'after' is the id of the last row the client saw; rows strictly older
+    (by created_at, tie-broken on id) come back, newest first.
+    """
+    if after is not None:
+        anchor = db.get(model, after)
+        if anchor is None:
+            raise HTTPException(status_code=404, detail="Pagination cursor not found")
+        query = query.filter(
+            tuple_(model.created_at, model.id) < (anchor.created_at, anchor.id)
+        )
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+# Statements for the simple get-by-foreign-key endpoints, built once at
+# import. Handlers pass only bind values, skipping per-request query
+# construction and letting every execution hit the compiled-SQL cache.
+_SPECS_BY_PRODUCT = select(models.ProductSpecification).where(
+    models.ProductSpecification.product_id == bindparam("pid"))
+_IMAGES_BY_PRODUCT = select(models.ProductImage).where(
+    models.ProductImage.product_id == bindparam("pid"))
+_REVIEWS_BY_PRODUCT = select(models.Review).where(
+    models.Review.product_id == bindparam("pid"))
+_ITEMS_BY_SUPPLIER_ORDER = select(models.SupplierOrderItem).where(
+    models.SupplierOrderItem.supplier_order_id == bindparam("oid"))
+_PAYMENTS_BY_SUPPLIER = select(models.SupplierPayment).where(
+    models.SupplierPayment.supplier_id == bindparam("sid"))
+_NOTIFICATIONS_BY_USER = select(models.Notification).where(
+    models.Notification.user_id == bindparam("uid"))
+
+# Both limiters guard unauthenticated oracles: login brute force and order
+# number/email enumeration on the public tracking endpoint
+login_rate_limit = rate_limiter("login", limit=10)
+track_rate_limit = rate_limiter("track_order", limit=10)
 
 # Create database tables
 # This is handled by Alembic migrations. It's good practice to not have this in the main app.
-# models.Base.metadata.create_all(bind=engine)
+# Opt-in escape hatch for throwaway local databases only — in any deployed
+# environment the schema comes from `alembic upgrade head`, and workers boot
+# without paying create_all's catalog reflection queries.
+if os.getenv("DEV_AUTO_CREATE"):
+    models.Base.metadata.create_all(bind=engine)
+
+logger = logging.getLogger(__name__)
+
+# orjson serializes the UUID/Decimal-heavy product and order payloads several
+# times faster than the stdlib encoder
+app = FastAPI(title="Tajdo Online Store API", version="1.0.0", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="Tajdo Online Store API", version="1.0.0")
+# Opt-in dev instrumentation: X-Query-Count header per response, for
+# spotting N+1 regressions while developing
+if os.getenv("DEV_QUERY_COUNT"):
+    from app.core.profiling import install_query_counter
+    install_query_counter(app, engine)
 
 # Mount static files directory for image uploads
 os.makedirs("static/images", exist_ok=True)
@@ -52,14 +115,14 @@ else:
     origins = list(settings.BACKEND_CORS_ORIGINS) if settings.BACKEND_CORS_ORIGINS else []
 
 # Always ensure production domains are included
-if "https://www.tajdo.shop" not in origins:
-    origins.append("https://www.tajdo.shop")
-if "https://tajdo.shop" not in origins:
-    origins.append("https://tajdo.shop")
+for required_origin in ("https://www.tajdo.shop", "https://tajdo.shop"):
+    if required_origin not in settings.BACKEND_CORS_ORIGIN_SET:
+        origins.append(required_origin)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    # frozenset gives the middleware O(1) origin membership checks per request
+    allow_origins=frozenset(origins),
     allow_origin_regex=r"https://ta[dj]o-frontend-draft.*\.vercel\.app",
     allow_credentials=True,
     allow_methods=["*"],
@@ -88,35 +151,49 @@ def read_root():
     print("Root endpoint accessed!")
     return {"message": "Welcome to Tajdo Online Store API"}
 
-@app.post("/token", response_model=schemas.Token)
+@app.post("/token", response_model=schemas.Token, dependencies=[Depends(login_rate_limit)])
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     print(f"DEBUG: Login attempt. Username: '{form_data.username}'")
     print(f"DEBUG: Login Password length: {len(form_data.password)}")
     
-    user = db.query(models.User).filter(func.lower(models.User.email) == form_data.username.lower()).first()
-    
+    user = await run_in_threadpool(
+        db.query(models.User).filter(func.lower(models.User.email) == form_data.username.lower()).first
+    )
+
+    # Verify once, off the event loop (the KDF takes tens of milliseconds)
+    password_ok = bool(user) and await verify_password_async(form_data.password, user.password_hash)
+
     if not user:
         print(f"DEBUG: Login failed - User '{form_data.username}' NOT FOUND in database.")
-    elif not verify_password(form_data.password, user.password_hash):
+    elif not password_ok:
         print(f"DEBUG: Login failed - Password verification failed for '{form_data.username}'.")
         print(f"DEBUG: Stored hash prefix: {user.password_hash[:7] if user.password_hash else 'None'}")
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Transparently upgrade legacy bcrypt hashes while we hold the plaintext
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(form_data.password)
+        await run_in_threadpool(db.commit)
+        invalidate_user_cache(user.email)
+
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "role": user.role}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer", "role": user.role}
 
-@app.post("/auth/admin/login", response_model=schemas.Token)
+@app.post("/auth/admin/login", response_model=schemas.Token, dependencies=[Depends(login_rate_limit)])
 async def admin_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(func.lower(models.User.email) == form_data.username.lower()).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await run_in_threadpool(
+        db.query(models.User).filter(func.lower(models.User.email) == form_data.username.lower()).first
+    )
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -124,7 +201,12 @@ async def admin_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Sess
         )
     if user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to access admin portal")
-    
+
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(form_data.password)
+        await run_in_threadpool(db.commit)
+        invalidate_user_cache(user.email)
+
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
         data={"sub": user.email, "role": "admin"}, expires_delta=access_token_expires
@@ -143,7 +225,7 @@ async def manual_twint_check(current_user: schemas.User = Depends(get_current_ad
 
 # TWINT Payment Analytics Endpoints
 @app.get("/admin/payments/twint/balance")
-async def get_twint_balance(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+def get_twint_balance(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     """Returns the sum of all confirmed TWINT transactions."""
     total = db.query(func.sum(models.Order.total)).filter(
         models.Order.payment_method == "twint",
@@ -152,7 +234,7 @@ async def get_twint_balance(db: Session = Depends(get_db), current_user: schemas
     return {"total_confirmed_twint_revenue": float(total)}
 
 @app.get("/admin/payments/twint/transactions", response_model=List[TwintTransactionSchema])
-async def get_twint_transactions(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+def get_twint_transactions(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     """Returns a list of all confirmed TWINT transactions for identification."""
     # We query the Order model directly and filter by confirmed twint payments
     # Eager load the 'user' relationship to avoid N+1 queries and ensure user data is available
@@ -179,7 +261,7 @@ async def get_twint_transactions(db: Session = Depends(get_db), current_user: sc
     ]
 
 @app.get("/admin/payments/card/transactions", response_model=List[CardTransactionSchema])
-async def get_card_transactions(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+def get_card_transactions(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     """Returns a list of all successful Card (Stripe) transactions."""
     # Query orders where payment_method is card and they aren't pending
     transactions = db.query(models.Order).options(joinedload(models.Order.user)).filter(
@@ -200,7 +282,7 @@ async def get_card_transactions(db: Session = Depends(get_db), current_user: sch
     ]
 
 @app.get("/admin/payments/card/balance")
-async def get_card_balance(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+def get_card_balance(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     """Returns the sum of all confirmed Card (Stripe) transactions from the database."""
     total = db.query(func.sum(models.Order.total)).filter(
         models.Order.payment_method == "card",
@@ -211,7 +293,7 @@ async def get_card_balance(db: Session = Depends(get_db), current_user: schemas.
 
 # Upload Endpoint
 @app.post("/upload/image")
-async def upload_image(request: Request, file: UploadFile = File(...), current_user: schemas.User = Depends(get_current_admin)):
+def upload_image(request: Request, file: UploadFile = File(...), current_user: schemas.User = Depends(get_current_admin)):
     file_extension = file.filename.split(".")[-1]
     filename = f"{uuid.uuid4()}.{file_extension}"
     file_path = f"static/images/{filename}"
@@ -228,31 +310,90 @@ async def upload_image(request: Request, file: UploadFile = File(...), current_u
 
 # Product Endpoints
 @app.get("/products/", response_model=List[schemas.Product])
-def read_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    products = db.query(models.Product).offset(skip).limit(limit).all()
-    
-    # Calculate average rating and review count efficiently
+def read_products(skip: int = 0, limit: int = 100, after: Optional[UUID] = None, db: Session = Depends(get_db_ro)):
+    # Catalog reads vastly outnumber writes, so serve repeat requests for the
+    # same pagination window from memory
+    cache_key = ("list", skip, limit, after)
+    cached = product_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Eager-load nested collections so serialization doesn't lazy-load per row
+    query = db.query(models.Product).options(
+        selectinload(models.Product.images),
+        selectinload(models.Product.specifications),
+    )
+    query = _keyset_page(query, models.Product, after, db)
+    if after is None:
+        # Legacy offset paging still honoured for existing clients
+        query = query.offset(skip)
+    products = query.limit(limit).all()
+
+    # Aggregate rating stats in SQL so only one row per product crosses the
+    # wire instead of every review
     product_ids = [p.id for p in products]
-    reviews = db.query(models.Review).filter(models.Review.product_id.in_(product_ids)).all()
-    
-    reviews_map = {}
-    for r in reviews:
-        if r.product_id not in reviews_map:
-            reviews_map[r.product_id] = []
-        reviews_map[r.product_id].append(r)
-        
+    stats = {
+        product_id: (avg_rating, review_count)
+        for product_id, avg_rating, review_count in db.query(
+            models.Review.product_id,
+            func.avg(models.Review.rating),
+            func.count(models.Review.id),
+        ).filter(models.Review.product_id.in_(product_ids)).group_by(models.Review.product_id)
+    }
+
     for product in products:
-        product_reviews = reviews_map.get(product.id, [])
-        if product_reviews:
-            avg_rating = sum(r.rating for r in product_reviews) / len(product_reviews)
-            product.rating = Decimal(avg_rating)
-            product.review_count = len(product_reviews)
-        else:
-            product.rating = Decimal(0)
-            product.review_count = 0
-            
+        avg_rating, review_count = stats.get(product.id, (0, 0))
+        product.rating = Decimal(avg_rating)
+        product.review_count = review_count
+
+    product_cache.set(cache_key, products)
     return products
 
+@app.get("/products/summary", response_model=List[schemas.ProductListItem])
+def read_products_summary(skip: int = 0, limit: int = 100, after: Optional[UUID] = None, db: Session = Depends(get_db_ro)):
+    # Grid and search views only render the card fields; selecting just
+    # those columns skips the description text and the images/specs
+    # secondary SELECTs, and serialization cost shrinks with the field count
+    cache_key = ("summary", skip, limit, after)
+    cached = product_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # The stored rating/review_count columns are never written, so join the
+    # live aggregates from reviews — the same numbers /products/ computes
+    review_stats = (
+        db.query(
+            models.Review.product_id.label("product_id"),
+            func.avg(models.Review.rating).label("rating"),
+            func.count(models.Review.id).label("review_count"),
+        )
+        .group_by(models.Review.product_id)
+        .subquery()
+    )
+    query = db.query(
+        models.Product.id,
+        models.Product.name,
+        models.Product.price,
+        models.Product.original_price,
+        models.Product.image_url,
+        func.coalesce(review_stats.c.rating, 0).label("rating"),
+        func.coalesce(review_stats.c.review_count, 0).label("review_count"),
+        models.Product.badge,
+        models.Product.in_stock,
+    ).outerjoin(review_stats, review_stats.c.product_id == models.Product.id)
+    query = _keyset_page(query, models.Product, after, db)
+    if after is None:
+        query = query.offset(skip)
+    rows = query.limit(limit).all()
+
+    # Validate and serialize the whole page in one pydantic-core pass and
+    # cache the finished bytes; repeat hits skip serialization entirely
+    body = schemas.ProductListPage.dump_json(
+        schemas.ProductListPage.validate_python(rows, from_attributes=True)
+    )
+    product_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
 @app.post("/products/", response_model=schemas.Product)
 def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     # Create the product
@@ -267,48 +408,58 @@ def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)
     db.add(db_product)
     db.flush() # Flush to get the product ID before creating related items
 
-    # Create nested specifications
+    # Insert nested rows as one multi-row INSERT each instead of one flush
+    # statement per child object
     if product.specifications:
-        for spec in product.specifications:
-            db_spec = models.ProductSpecification(product_id=db_product.id, spec=spec.spec)
-            db.add(db_spec)
+        db.execute(insert(models.ProductSpecification), [
+            {"product_id": db_product.id, "spec": spec.spec}
+            for spec in product.specifications
+        ])
 
-    # Create nested images
     if product.images:
-        for image in product.images:
-            db_image = models.ProductImage(
-                product_id=db_product.id, 
-                url=image.url, 
-                alt_text=image.alt_text, 
-                sort_order=image.sort_order
-            )
-            db.add(db_image)
+        db.execute(insert(models.ProductImage), [
+            {
+                "product_id": db_product.id,
+                "url": image.url,
+                "alt_text": image.alt_text,
+                "sort_order": image.sort_order,
+            }
+            for image in product.images
+        ])
 
     db.commit()
     db.refresh(db_product)
+    product_cache.invalidate()
     return db_product
 
 @app.get("/products/{product_id}", response_model=schemas.Product)
-def read_product(product_id: UUID, db: Session = Depends(get_db)):
-    db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
+def read_product(product_id: UUID, db: Session = Depends(get_db_ro)):
+    cache_key = ("item", product_id)
+    cached = product_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    db_product = db.query(models.Product).options(
+        selectinload(models.Product.images),
+        selectinload(models.Product.specifications),
+    ).filter(models.Product.id == product_id).first()
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    # Calculate rating
-    reviews = db.query(models.Review).filter(models.Review.product_id == product_id).all()
-    if reviews:
-        avg_rating = sum(r.rating for r in reviews) / len(reviews)
-        db_product.rating = Decimal(avg_rating)
-        db_product.review_count = len(reviews)
-    else:
-        db_product.rating = Decimal(0)
-        db_product.review_count = 0
-        
+
+    # Aggregate the rating in SQL instead of pulling every review row
+    avg_rating, review_count = db.query(
+        func.avg(models.Review.rating),
+        func.count(models.Review.id),
+    ).filter(models.Review.product_id == product_id).one()
+    db_product.rating = Decimal(avg_rating) if review_count else Decimal(0)
+    db_product.review_count = review_count
+
+    product_cache.set(cache_key, db_product)
     return db_product
 
 @app.put("/products/{product_id}", response_model=schemas.Product)
 def update_product(product_id: UUID, product_update: schemas.ProductUpdate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_product = db.query(models.Product).filter(models.Product.id == product_id).first()
+    db_product = db.get(models.Product, product_id)
     if not db_product:
         raise HTTPException(status_code=404, detail="Product not found")
     
@@ -318,12 +469,28 @@ def update_product(product_id: UUID, product_update: schemas.ProductUpdate, db:
     
     db.commit()
     db.refresh(db_product)
+    product_cache.invalidate()
     return db_product
 
 # Category Endpoints
 @app.get("/categories/", response_model=List[schemas.Category])
-def read_categories(db: Session = Depends(get_db)):
-    return db.query(models.Category).all()
+def read_categories(request: Request, db: Session = Depends(get_db_ro)):
+    # Cached as pre-serialized bytes with a strong ETag: repeat visitors get
+    # a bodyless 304, everyone else gets bytes straight from memory with no
+    # per-request query or serialization
+    cached = category_cache.get("all")
+    if cached is None:
+        categories = db.query(models.Category).all()
+        body = orjson.dumps([
+            schemas.Category.model_validate(c).model_dump() for c in categories
+        ])
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        cached = (body, etag)
+        category_cache.set("all", cached)
+    body, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @app.post("/categories/", response_model=schemas.Category)
 def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
@@ -331,11 +498,12 @@ def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    category_cache.invalidate()
     return db_category
 
 @app.put("/categories/{category_id}", response_model=schemas.Category)
 def update_category(category_id: str, category_update: schemas.CategoryUpdate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
+    db_category = db.get(models.Category, category_id)
     if not db_category:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -345,20 +513,22 @@ def update_category(category_id: str, category_update: schemas.CategoryUpdate, d
     
     db.commit()
     db.refresh(db_category)
+    category_cache.invalidate()
     return db_category
 
 @app.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_category(category_id: str, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
+    db_category = db.get(models.Category, category_id)
     if not db_category:
         raise HTTPException(status_code=404, detail="Category not found")
     db.delete(db_category)
     db.commit()
+    category_cache.invalidate()
     return
 
 # Page Content Endpoints
 @app.get("/pages/{slug}/", response_model=schemas.Page)
-def read_page_content(slug: str, lang: str = "en", db: Session = Depends(get_db)):
+def read_page_content(slug: str, lang: str = "en", db: Session = Depends(get_db_ro)):
     # Use func.lower to ensure case-insensitive matching
     db_page = db.query(models.Page).filter(
         func.lower(models.Page.slug) == slug.lower(),
@@ -413,13 +583,14 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     try:
         print(f"DEBUG: Received registration request for {user.email}")
         print(f"DEBUG: Password length received: {len(user.password)}")
-        db_user = db.query(models.User).filter(func.lower(models.User.email) == user.email.lower()).first()
-        if db_user:
+        # EXISTS-style probe: no reason to pull the whole row (including the
+        # password hash) just to test presence
+        email_taken = db.query(literal(True)).filter(
+            db.query(models.User).filter(func.lower(models.User.email) == user.email.lower()).exists()
+        ).scalar()
+        if email_taken:
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        if len(user.password.encode('utf-8')) > 72:
-            raise HTTPException(status_code=400, detail=f"Password is too long. Received {len(user.password)} characters. Maximum length is 72 bytes.")
-
         hashed_password = get_password_hash(user.password)
         print(f"DEBUG: Registered user {user.email}. Hash length: {len(hashed_password)}")
         db_user = models.User(
@@ -438,8 +609,6 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         print(f"CRITICAL ERROR creating user: {e}")
-        if "password cannot be longer than 72 bytes" in str(e):
-            raise HTTPException(status_code=400, detail=f"Password is too long. Received {len(user.password)} characters. Maximum length is 72 bytes.")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 @app.get("/users/me/", response_model=schemas.User)
@@ -449,7 +618,7 @@ async def read_users_me(current_user: schemas.User = Depends(get_current_user)):
 # Address Endpoints
 @app.post("/addresses/", response_model=schemas.Address)
 def create_address(address: schemas.AddressCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(address.user_id) != str(current_user.id):
+    if address.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to create address for this user")
     
     # If the new address is set as default, unset is_default for all other addresses of this user
@@ -464,7 +633,7 @@ def create_address(address: schemas.AddressCreate, db: Session = Depends(get_db)
 
 @app.get("/users/{user_id}/addresses/", response_model=List[schemas.Address])
 def read_user_addresses(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id):
+    if user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view addresses for this user")
     addresses = db.query(models.Address).filter(models.Address.user_id == user_id).all()
     return addresses
@@ -472,57 +641,61 @@ def read_user_addresses(user_id: UUID, db: Session = Depends(get_db), current_us
 # Wishlist Endpoints
 @app.post("/wishlists/", response_model=schemas.Wishlist)
 def add_to_wishlist(wishlist_item: schemas.WishlistBase, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    existing_item = db.query(models.Wishlist).filter(
-        models.Wishlist.user_id == current_user.id,
-        models.Wishlist.product_id == wishlist_item.product_id
-    ).first()
-    if existing_item:
-        return existing_item
-
-    db_wishlist_item = models.Wishlist(user_id=current_user.id, **wishlist_item.dict())
-    db.add(db_wishlist_item)
+    # Same single-round-trip upsert as add_to_cart; the no-op DO UPDATE
+    # makes RETURNING yield the row whether it was inserted or already there
+    stmt = pg_insert(models.Wishlist).values(
+        user_id=current_user.id,
+        product_id=wishlist_item.product_id,
+    ).on_conflict_do_update(
+        index_elements=[models.Wishlist.user_id, models.Wishlist.product_id],
+        set_={"product_id": wishlist_item.product_id},
+    ).returning(models.Wishlist)
+    db_wishlist_item = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(db_wishlist_item)
     return db_wishlist_item
 
 @app.get("/users/{user_id}/wishlist/", response_model=List[schemas.Product])
 def read_user_wishlist(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id):
+    if user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view wishlist for this user")
-    wishlist_products = db.query(models.Product).join(models.Wishlist).filter(models.Wishlist.user_id == user_id).all()
+    wishlist_products = db.query(models.Product).options(
+        selectinload(models.Product.images),
+        selectinload(models.Product.specifications),
+    ).join(models.Wishlist).filter(models.Wishlist.user_id == user_id).all()
     return wishlist_products
 
 @app.delete("/wishlists/", status_code=status.HTTP_204_NO_CONTENT)
 def remove_from_wishlist(wishlist_item: schemas.WishlistBase, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_wishlist_item = db.query(models.Wishlist).filter(
+    # Delete directly and inspect the rowcount; no need to fetch the row first
+    deleted = db.query(models.Wishlist).filter(
         models.Wishlist.user_id == current_user.id,
         models.Wishlist.product_id == wishlist_item.product_id
-    ).first()
-    if db_wishlist_item is None:
-        raise HTTPException(status_code=404, detail="Item not found in wishlist")
-    db.delete(db_wishlist_item)
+    ).delete()
     db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Item not found in wishlist")
     return
 
 # CartItem Endpoints
 @app.post("/cart/items/", response_model=schemas.CartItem)
 def add_to_cart(cart_item: schemas.CartItemBase, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_cart_item = db.query(models.CartItem).filter(
-        models.CartItem.user_id == current_user.id,
-        models.CartItem.product_id == cart_item.product_id
-    ).first()
-    if db_cart_item:
-        db_cart_item.quantity += cart_item.quantity
-    else:
-        db_cart_item = models.CartItem(user_id=current_user.id, **cart_item.dict())
-    db.add(db_cart_item)
+    # Single-round-trip upsert on the (user_id, product_id) primary key
+    # instead of select-then-insert/update; RETURNING hands back the row
+    stmt = pg_insert(models.CartItem).values(
+        user_id=current_user.id,
+        product_id=cart_item.product_id,
+        quantity=cart_item.quantity,
+    ).on_conflict_do_update(
+        index_elements=[models.CartItem.user_id, models.CartItem.product_id],
+        set_={"quantity": models.CartItem.quantity + cart_item.quantity},
+    ).returning(models.CartItem)
+    db_cart_item = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(db_cart_item)
     return db_cart_item
 
 @app.get("/users/{user_id}/cart/items/", response_model=List[schemas.CartItem])
 def read_user_cart_items(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id):
+    if user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view cart for this user")
     cart_items = db.query(models.CartItem).filter(models.CartItem.user_id == user_id).all()
     return cart_items
@@ -542,63 +715,74 @@ def update_cart_item(product_id: UUID, cart_item_update: schemas.CartItemUpdate,
 
 @app.delete("/cart/items/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_from_cart(product_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_cart_item = db.query(models.CartItem).filter(
+    deleted = db.query(models.CartItem).filter(
         models.CartItem.user_id == current_user.id,
         models.CartItem.product_id == product_id
-    ).first()
-    if db_cart_item is None:
-        raise HTTPException(status_code=404, detail="Item not found in cart")
-    db.delete(db_cart_item)
+    ).delete()
     db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Item not found in cart")
     return
 
 # Order Endpoints
+def _order_loader_options():
+    """Eager-load everything schemas.Order serializes, so order reads don't
+    trigger one lazy SELECT per nested relationship."""
+    return (
+        selectinload(models.Order.items),
+        selectinload(models.Order.status_history),
+        joinedload(models.Order.user),
+        joinedload(models.Order.shipping_address),
+    )
+
 @app.post("/orders/", response_model=schemas.Order)
-def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(order.user_id) != str(current_user.id):
+def create_order(order: schemas.OrderCreate, background_tasks: BackgroundTasks = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
+    if order.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to create order for this user")
 
-    # Calculate subtotal, tax, total
-    gross_total = Decimal(0)
+    # Fetch every ordered product in one IN query instead of one SELECT per
+    # cart line; the rest of the item construction is then pure Python
+    product_ids = [item.product_id for item in order.items]
+    products_by_id = {
+        p.id: p for p in db.query(models.Product).filter(models.Product.id.in_(product_ids)).all()
+    }
+
+    # Calculate subtotal, tax, total. All money math runs in integer cents —
+    # two decimal places are exact in int, the arithmetic is far cheaper than
+    # chained Decimal ops, and nothing needs quantize until the boundary.
+    gross_cents = 0
     order_items = []
     for item in order.items:
-        product = db.query(models.Product).filter(models.Product.id == item.product_id).first()
+        product = products_by_id.get(item.product_id)
         if not product:
             raise HTTPException(status_code=404, detail=f"Product with ID {item.product_id} not found")
-        
+
         # In a Tax Inclusive model, the product price is the gross price
-        item_total = product.price * item.quantity
-        gross_total += item_total
-        order_items.append(models.OrderItem(
-            product_id=item.product_id,
-            product_name=product.name,
-            unit_price=product.price,
-            quantity=item.quantity,
-            total=item_total,
-            manufacturing_cost=product.manufacturing_cost,
-            transport_cost=product.transport_cost
-        ))
-    
-    shipping_cost = Decimal(0) # DDP Shipping (Free to customer)
-    
+        item_total_cents = int(product.price * 100) * item.quantity
+        gross_cents += item_total_cents
+        order_items.append({
+            "product_id": item.product_id,
+            "product_name": product.name,
+            "unit_price": product.price,
+            "quantity": item.quantity,
+            "total": Decimal(item_total_cents).scaleb(-2),
+            "manufacturing_cost": product.manufacturing_cost,
+            "transport_cost": product.transport_cost,
+        })
+
+    shipping_cents = 0 # DDP Shipping (Free to customer)
+
     # Tax Inclusive Calculation (Switzerland Standard Rate 8.1%)
-    # Formula: Tax = Total - (Total / (1 + Rate))
-    tax_rate = Decimal("0.081")
-    total = gross_total + shipping_cost
-    
-    # Calculate the net amount (pre-tax)
-    net_total = total / (1 + tax_rate)
-    
-    # Extract the tax amount
-    tax = total - net_total
-    
-    # Subtotal in DB usually refers to pre-tax amount of items
-    subtotal = net_total
-    
-    # Rounding to 2 decimal places for currency
-    tax = tax.quantize(Decimal("0.01"))
-    subtotal = subtotal.quantize(Decimal("0.01"))
-    total = total.quantize(Decimal("0.01"))
+    # Formula: Tax = Total - (Total / (1 + Rate)); in cents that's
+    # net = total * 1000 / 1081, rounded to the nearest cent
+    total_cents = gross_cents + shipping_cents
+    net_cents = (total_cents * 1000 + 540) // 1081
+    tax_cents = total_cents - net_cents
+
+    # Decimal only at the boundary, for the Numeric(10,2) columns
+    total = Decimal(total_cents).scaleb(-2)
+    subtotal = Decimal(net_cents).scaleb(-2)
+    tax = Decimal(tax_cents).scaleb(-2)
 
     # Determine initial status based on payment method
     initial_status = "processing"
@@ -621,14 +805,14 @@ def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db), curr
             
             # Amount verification (intent.amount is in cents)
             # Use abs difference check to handle minor rounding variances (1 cent tolerance)
-            if abs(intent.amount - int(round(total * 100))) > 1:
+            if abs(intent.amount - total_cents) > 1:
                 raise HTTPException(status_code=400, detail="Payment amount mismatch.")
                 
         except stripe.error.StripeError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
+    # order_number comes from the DB sequence default (see models.Order)
     db_order = models.Order(
-        order_number=f"ORD-{uuid.uuid4().hex[:6].upper()}",
         user_id=order.user_id,
         shipping_address_id=order.shipping_address_id,
         status=initial_status,
@@ -640,29 +824,32 @@ def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db), curr
         payment_method=order.payment_method,
         payment_intent_id=order.payment_intent_id, # Pass from frontend
         notes=order.notes,
-        items=order_items
     )
-    
+
     db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
+    db.flush() # Assigns the order ID the item rows reference
 
-    # Clear ordered items from the cart
-    for item in order.items:
-        db.query(models.CartItem).filter(
-            models.CartItem.user_id == current_user.id,
-            models.CartItem.product_id == item.product_id
-        ).delete()
+    # All line items go in as a single multi-row INSERT
+    db.execute(insert(models.OrderItem), [
+        {**row, "order_id": db_order.id} for row in order_items
+    ])
+
+    # Clear ordered items from the cart in one DELETE ... IN statement;
+    # synchronize_session=False skips the in-session bookkeeping sweep, which
+    # is safe because none of these rows are loaded in this session
+    db.query(models.CartItem).filter(
+        models.CartItem.user_id == current_user.id,
+        models.CartItem.product_id.in_(product_ids)
+    ).delete(synchronize_session=False)
 
-    # Create Rescue Contribution (10% of total)
-    rescue_amount = (total * Decimal("0.10")).quantize(Decimal("0.01"))
+    # Create Rescue Contribution (10% of total, rounded to the nearest cent)
+    rescue_amount = Decimal((total_cents + 5) // 10).scaleb(-2)
     db_rescue = models.RescueContribution(
         order_id=db_order.id,
         amount=rescue_amount,
         currency=db_order.currency
     )
     db.add(db_rescue)
-    db.commit()
 
     # Create a notification for the user
     notification = models.Notification(
@@ -673,28 +860,34 @@ def create_order(order: schemas.OrderCreate, db: Session = Depends(get_db), curr
         message=f"Thank you for your purchase! Your order {db_order.order_number} has been placed."
     )
     db.add(notification)
+
+    # One transaction for the order, its items, the cart cleanup, the rescue
+    # contribution and the notification: a single fsync, and a failure
+    # anywhere rolls back everything instead of leaving a half-created order
     db.commit()
-    db.refresh(notification)
+    db.refresh(db_order)
+    rescue_cache.invalidate()
 
-    # Send confirmation email
+    # Send confirmation email after the response, off the request path; the
+    # provider round trip takes hundreds of ms and a failure there should
+    # never fail the order.
     # For TWINT, we wait until payment is confirmed by the listener
     if initial_status != "pending_payment":
-        try:
-            email_service.send_order_confirmation(db_order, current_user)
-        except Exception as e:
-            print(f"Failed to send confirmation email: {e}")
-            # Do not fail the order if email fails
+        background_tasks.add_task(email_service.send_order_confirmation, db_order, current_user)
 
     return db_order
 
 @app.get("/admin/orders/", response_model=List[schemas.Order])
-def read_all_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    orders = db.query(models.Order).offset(skip).limit(limit).all()
+def read_all_orders(skip: int = 0, limit: int = 100, after: Optional[UUID] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    query = _keyset_page(db.query(models.Order).options(*_order_loader_options()), models.Order, after, db)
+    if after is None:
+        query = query.offset(skip)
+    orders = query.limit(limit).all()
     return orders
 
 @app.delete("/admin/orders/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_order(order_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    db_order = db.get(models.Order, order_id)
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -709,42 +902,47 @@ def delete_order(order_id: UUID, db: Session = Depends(get_db), current_user: sc
     db.commit()
     return
 
-@app.get("/orders/track")
-async def track_order(
+@app.get("/orders/track", dependencies=[Depends(track_rate_limit)])
+def track_order(
     order_number: str,
     email: str,
     db: Session = Depends(get_db)
 ):
-    order = db.query(models.Order).filter(models.Order.order_number == order_number).first()
-    
+    # One JOINed query checks the order number and the email together, so
+    # there is no lazy user SELECT and no separate comparison step whose
+    # timing could hint whether the order number alone was valid
+    order = db.query(models.Order).join(models.User).options(
+        contains_eager(models.Order.user)
+    ).filter(
+        models.Order.order_number == order_number,
+        func.lower(models.User.email) == email.lower(),
+    ).first()
+
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    
-    if order.user.email.lower() != email.lower():
-        raise HTTPException(status_code=404, detail="Order not found")
-    
+
     return order
 
 @app.get("/orders/{order_id}", response_model=schemas.Order)
 def read_order(order_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    db_order = db.query(models.Order).options(*_order_loader_options()).filter(models.Order.id == order_id).first()
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-    if str(db_order.user_id) != str(current_user.id) and current_user.role != "admin":
+    if db_order.user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view this order")
     return db_order
 
 
 @app.get("/users/{user_id}/orders/", response_model=List[schemas.Order])
 def read_user_orders(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id) and current_user.role != "admin":
+    if user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view orders for this user")
-    orders = db.query(models.Order).filter(models.Order.user_id == user_id).all()
+    orders = db.query(models.Order).options(*_order_loader_options()).filter(models.Order.user_id == user_id).all()
     return orders
 
 @app.put("/orders/{order_id}/status", response_model=schemas.Order)
-def update_order_status(order_id: UUID, new_status: str, tracking_number: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
+def update_order_status(order_id: UUID, new_status: str, background_tasks: BackgroundTasks = None, tracking_number: Optional[str] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    db_order = db.get(models.Order, order_id)
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -797,18 +995,18 @@ def update_order_status(order_id: UUID, new_status: str, tracking_number: Option
     db.commit()
     db.refresh(notification)
 
-    # Send email notification for status update
-    try:
-        if new_status == "shipped":
-            email_service.send_order_shipped(db_order, db_order.user, tracking_number)
-        elif new_status == "delivered":
-            email_service.send_order_delivered(db_order, db_order.user)
-        elif new_status == "cancelled":
-            email_service.send_order_cancelled(db_order, db_order.user)
-        elif new_status == "refunded":
-            email_service.send_order_refunded(db_order, db_order.user)
-    except Exception as e:
-        print(f"Failed to send status update email: {e}")
+    # Send email notification for status update after the response. Resolve
+    # the user relationship here, while the session is still open, so the
+    # background task never triggers a lazy load on a detached instance.
+    order_user = db_order.user
+    if new_status == "shipped":
+        background_tasks.add_task(email_service.send_order_shipped, db_order, order_user, tracking_number)
+    elif new_status == "delivered":
+        background_tasks.add_task(email_service.send_order_delivered, db_order, order_user)
+    elif new_status == "cancelled":
+        background_tasks.add_task(email_service.send_order_cancelled, db_order, order_user)
+    elif new_status == "refunded":
+        background_tasks.add_task(email_service.send_order_refunded, db_order, order_user)
 
     return db_order
 
@@ -819,11 +1017,12 @@ def create_product_specification(product_id: UUID, spec: schemas.ProductSpecific
     db.add(db_spec)
     db.commit()
     db.refresh(db_spec)
+    product_cache.invalidate()
     return db_spec
 
 @app.get("/products/{product_id}/specifications/", response_model=List[schemas.ProductSpecification])
-def read_product_specifications(product_id: UUID, db: Session = Depends(get_db)):
-    specs = db.query(models.ProductSpecification).filter(models.ProductSpecification.product_id == product_id).all()
+def read_product_specifications(product_id: UUID, db: Session = Depends(get_db_ro)):
+    specs = db.execute(_SPECS_BY_PRODUCT, {"pid": product_id}).scalars().all()
     return specs
 
 # Product Image Endpoints
@@ -833,24 +1032,33 @@ def create_product_image(product_id: UUID, image: schemas.ProductImageCreate, db
     db.add(db_image)
     db.commit()
     db.refresh(db_image)
+    product_cache.invalidate()
     return db_image
 
 @app.get("/products/{product_id}/images/", response_model=List[schemas.ProductImage])
-def read_product_images(product_id: UUID, db: Session = Depends(get_db)):
-    images = db.query(models.ProductImage).filter(models.ProductImage.product_id == product_id).all()
+def read_product_images(product_id: UUID, db: Session = Depends(get_db_ro)):
+    images = db.execute(_IMAGES_BY_PRODUCT, {"pid": product_id}).scalars().all()
     return images
 
 # Notification Endpoints
 @app.post("/notifications/", response_model=schemas.Notification)
 def create_notification(notification: schemas.NotificationCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(notification.user_id) != str(current_user.id) and current_user.role != "admin":
+    if notification.user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to create notification for this user")
     
     if notification.order_id:
-        db_order = db.query(models.Order).filter(models.Order.id == notification.order_id).first()
-        if not db_order:
-            raise HTTPException(status_code=404, detail="Order not found")
-        if str(db_order.user_id) != str(notification.user_id):
+        # One SELECT checks existence and ownership together; only the
+        # failure path pays a second probe to pick the right status code
+        order_owned = db.query(models.Order.id).filter(
+            models.Order.id == notification.order_id,
+            models.Order.user_id == notification.user_id
+        ).scalar()
+        if order_owned is None:
+            order_exists = db.query(literal(True)).filter(
+                db.query(models.Order).filter(models.Order.id == notification.order_id).exists()
+            ).scalar()
+            if not order_exists:
+                raise HTTPException(status_code=404, detail="Order not found")
             raise HTTPException(status_code=400, detail="Notification user_id does not match the order's user_id")
             
     db_notification = models.Notification(**notification.dict())
@@ -861,9 +1069,9 @@ def create_notification(notification: schemas.NotificationCreate, db: Session =
 
 @app.get("/users/{user_id}/notifications/", response_model=List[schemas.Notification])
 def read_user_notifications(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id) and current_user.role != "admin":
+    if user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view notifications for this user")
-    notifications = db.query(models.Notification).filter(models.Notification.user_id == user_id).all()
+    notifications = db.execute(_NOTIFICATIONS_BY_USER, {"uid": user_id}).scalars().all()
     return notifications
 
 @app.get("/admin/users/", response_model=List[schemas.User])
@@ -897,6 +1105,7 @@ def promote_user_to_admin(request: schemas.UserPromoteRequest, db: Session = Dep
     db_user.role = "admin"
     db.commit()
     db.refresh(db_user)
+    invalidate_user_cache(db_user.email)
     return db_user
 
 @app.post("/admin/users/demote", response_model=schemas.User)
@@ -916,26 +1125,29 @@ def demote_admin(request: schemas.UserPromoteRequest, db: Session = Depends(get_
     db_user.role = "customer"
     db.commit()
     db.refresh(db_user)
+    invalidate_user_cache(db_user.email)
     return db_user
 
 @app.delete("/admin/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
     if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="You cannot delete yourself")
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = db.get(models.User, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    deleted_email = db_user.email
     db.delete(db_user)
     db.commit()
+    invalidate_user_cache(deleted_email)
     return
 
 
 @app.put("/notifications/{notification_id}/read", response_model=schemas.Notification)
 def mark_notification_as_read(notification_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_notification = db.query(models.Notification).filter(models.Notification.id == notification_id).first()
+    db_notification = db.get(models.Notification, notification_id)
     if db_notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
-    if str(db_notification.user_id) != str(current_user.id):
+    if db_notification.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to mark this notification as read")
     db_notification.is_read = True
     db.commit()
@@ -952,13 +1164,16 @@ def create_supplier(supplier: schemas.SupplierCreate, db: Session = Depends(get_
     return db_supplier
 
 @app.get("/suppliers/", response_model=List[schemas.Supplier])
-def read_suppliers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    suppliers = db.query(models.Supplier).offset(skip).limit(limit).all()
+def read_suppliers(skip: int = 0, limit: int = 100, after: Optional[str] = None, db: Session = Depends(get_db_ro)):
+    query = _keyset_page(db.query(models.Supplier), models.Supplier, after, db)
+    if after is None:
+        query = query.offset(skip)
+    suppliers = query.limit(limit).all()
     return suppliers
 
 @app.get("/suppliers/{supplier_id}", response_model=schemas.Supplier)
-def read_supplier(supplier_id: str, db: Session = Depends(get_db)):
-    db_supplier = db.query(models.Supplier).filter(models.Supplier.id == supplier_id).first()
+def read_supplier(supplier_id: str, db: Session = Depends(get_db_ro)):
+    db_supplier = db.get(models.Supplier, supplier_id)
     if db_supplier is None:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return db_supplier
@@ -973,13 +1188,16 @@ def create_supplier_order(supplier_order: schemas.SupplierOrderCreate, db: Sessi
     return db_supplier_order
 
 @app.get("/supplier_orders/", response_model=List[schemas.SupplierOrder])
-def read_supplier_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    supplier_orders = db.query(models.SupplierOrder).offset(skip).limit(limit).all()
+def read_supplier_orders(skip: int = 0, limit: int = 100, after: Optional[UUID] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    query = _keyset_page(db.query(models.SupplierOrder), models.SupplierOrder, after, db)
+    if after is None:
+        query = query.offset(skip)
+    supplier_orders = query.limit(limit).all()
     return supplier_orders
 
 @app.get("/supplier_orders/{order_id}", response_model=schemas.SupplierOrder)
 def read_supplier_order(order_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_supplier_order = db.query(models.SupplierOrder).filter(models.SupplierOrder.id == order_id).first()
+    db_supplier_order = db.get(models.SupplierOrder, order_id)
     if db_supplier_order is None:
         raise HTTPException(status_code=404, detail="Supplier Order not found")
     return db_supplier_order
@@ -990,12 +1208,23 @@ def create_supplier_order_item(item: schemas.SupplierOrderItemCreate, db: Sessio
     db_item = models.SupplierOrderItem(**item.dict())
     db.add(db_item)
     db.commit()
-    db.refresh(db_item)
+    # No refresh: nothing here is server-generated (id is a client-side
+    # uuid4) and expire_on_commit=False keeps attributes after commit
     return db_item
 
+@app.post("/supplier_order_items/bulk", response_model=List[schemas.SupplierOrderItem])
+def create_supplier_order_items_bulk(items: List[schemas.SupplierOrderItemCreate], db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    # Receiving a delivery means dozens of line items at once; one request
+    # and one transaction instead of a POST per item. add_all + a single
+    # commit flushes as a batched multi-row INSERT.
+    db_items = [models.SupplierOrderItem(**item.dict()) for item in items]
+    db.add_all(db_items)
+    db.commit()
+    return db_items
+
 @app.get("/supplier_orders/{order_id}/items/", response_model=List[schemas.SupplierOrderItem])
 def read_supplier_order_items(order_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    items = db.query(models.SupplierOrderItem).filter(models.SupplierOrderItem.supplier_order_id == order_id).all()
+    items = db.execute(_ITEMS_BY_SUPPLIER_ORDER, {"oid": order_id}).scalars().all()
     return items
 
 # Supplier Payment Endpoints
@@ -1004,140 +1233,238 @@ def create_supplier_payment(payment: schemas.SupplierPaymentCreate, db: Session
     db_payment = models.SupplierPayment(**payment.dict())
     db.add(db_payment)
     db.commit()
-    db.refresh(db_payment)
+    # No refresh: the INSERT's RETURNING already populated server defaults
+    # and expire_on_commit=False keeps them after commit
     return db_payment
 
 @app.get("/suppliers/{supplier_id}/payments/", response_model=List[schemas.SupplierPayment])
 def read_supplier_payments(supplier_id: str, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    payments = db.query(models.SupplierPayment).filter(models.SupplierPayment.supplier_id == supplier_id).all()
+    payments = db.execute(_PAYMENTS_BY_SUPPLIER, {"sid": supplier_id}).scalars().all()
     return payments
 
 # Complaint Endpoints
 @app.get("/admin/complaints/", response_model=List[schemas.Complaint])
-def read_all_complaints(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    complaints = db.query(models.Complaint).offset(skip).limit(limit).all()
+def read_all_complaints(skip: int = 0, limit: int = Query(100, ge=1, le=500), after: Optional[UUID] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    query = _keyset_page(db.query(models.Complaint), models.Complaint, after, db)
+    if after is None:
+        query = query.offset(skip)
+    complaints = query.limit(limit).all()
     return complaints
 
 @app.post("/complaints/", response_model=schemas.Complaint)
 def create_complaint(complaint: schemas.ComplaintCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(complaint.user_id) != str(current_user.id):
+    if complaint.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to create complaint for this user")
     
     if complaint.order_id:
-        db_order = db.query(models.Order).filter(models.Order.id == complaint.order_id).first()
-        if not db_order:
-            raise HTTPException(status_code=404, detail="Order not found")
-        if str(db_order.user_id) != str(complaint.user_id):
+        # One SELECT checks existence and ownership together; only the
+        # failure path pays a second probe to pick the right status code
+        order_owned = db.query(models.Order.id).filter(
+            models.Order.id == complaint.order_id,
+            models.Order.user_id == complaint.user_id
+        ).scalar()
+        if order_owned is None:
+            order_exists = db.query(literal(True)).filter(
+                db.query(models.Order).filter(models.Order.id == complaint.order_id).exists()
+            ).scalar()
+            if not order_exists:
+                raise HTTPException(status_code=404, detail="Order not found")
             raise HTTPException(status_code=400, detail="Complaint user_id does not match the order's user_id")
             
     db_complaint = models.Complaint(**complaint.dict())
     db.add(db_complaint)
     db.commit()
-    db.refresh(db_complaint)
+    # No refresh: the INSERT's RETURNING already populated server defaults
+    # and expire_on_commit=False keeps them after commit
     return db_complaint
 
 @app.get("/users/{user_id}/complaints/", response_model=List[schemas.Complaint])
 def read_user_complaints(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id) and current_user.role != "admin":
+    # Authorization short-circuits before any query is built; UUIDs compare
+    # directly (by value, in C) with no str() formatting round trip
+    if user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view complaints for this user")
     complaints = db.query(models.Complaint).filter(models.Complaint.user_id == user_id).all()
     return complaints
 
+@app.get("/me/complaints/", response_model=List[schemas.Complaint])
+def read_my_complaints(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
+    # "Me" routes scope by the authenticated identity, so there's no
+    # path-parameter ownership check to run at all
+    complaints = db.query(models.Complaint).filter(models.Complaint.user_id == current_user.id).all()
+    return complaints
+
 # Return Endpoints
 @app.get("/admin/returns/", response_model=List[schemas.Return])
-def read_all_returns(skip: int =0, limit: int =100, db: Session = Depends (get_db), current_user: schemas.User = Depends(get_current_admin)):
-    returns = db.query(models.Return).offset(skip).limit(limit).all()
+def read_all_returns(skip: int =0, limit: int = Query(100, ge=1, le=500), after: Optional[UUID] = None, db: Session = Depends (get_db), current_user: schemas.User = Depends(get_current_admin)):
+    query = _keyset_page(db.query(models.Return), models.Return, after, db)
+    if after is None:
+        query = query.offset(skip)
+    returns = query.limit(limit).all()
     return returns
 
 @app.post("/returns/", response_model=schemas.Return)
 def create_return(return_request: schemas.ReturnCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(return_request.user_id) != str(current_user.id):
+    if return_request.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to create return for this user")
     
-    db_order = db.query(models.Order).filter(models.Order.id == return_request.order_id).first()
-    if not db_order:
-        raise HTTPException(status_code=404, detail="Order not found")
-    if str(db_order.user_id) != str(return_request.user_id):
+    order_owned = db.query(models.Order.id).filter(
+        models.Order.id == return_request.order_id,
+        models.Order.user_id == return_request.user_id
+    ).scalar()
+    if order_owned is None:
+        order_exists = db.query(literal(True)).filter(
+            db.query(models.Order).filter(models.Order.id == return_request.order_id).exists()
+        ).scalar()
+        if not order_exists:
+            raise HTTPException(status_code=404, detail="Order not found")
         raise HTTPException(status_code=400, detail="Return user_id does not match the order's user_id")
 
     db_return = models.Return(**return_request.dict())
     db.add(db_return)
     db.commit()
-    db.refresh(db_return)
+    # No refresh: the INSERT's RETURNING already populated server defaults
+    # and expire_on_commit=False keeps them after commit
     return db_return
 
 @app.get("/users/{user_id}/returns/", response_model=List[schemas.Return])
 def read_user_returns(user_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(user_id) != str(current_user.id) and current_user.role != "admin":
+    if user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to view returns for this user")
     returns = db.query(models.Return).filter(models.Return.user_id == user_id).all()
     return returns
 
+@app.get("/me/returns/", response_model=List[schemas.Return])
+def read_my_returns(db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
+    returns = db.query(models.Return).filter(models.Return.user_id == current_user.id).all()
+    return returns
+
 # Review Endpoints
 @app.get("/admin/reviews/", response_model=List[schemas.Review])
-def read_all_reviews(skip: int =0, limit: int =100, db: Session = Depends (get_db), current_user: schemas.User = Depends(get_current_admin)):
-    reviews = db.query(models.Review).offset(skip).limit(limit).all()
+def read_all_reviews(skip: int =0, limit: int = Query(100, ge=1, le=500), after: Optional[UUID] = None, db: Session = Depends (get_db), current_user: schemas.User = Depends(get_current_admin)):
+    query = _keyset_page(db.query(models.Review), models.Review, after, db)
+    if after is None:
+        query = query.offset(skip)
+    reviews = query.limit(limit).all()
     return reviews
 
 @app.post("/reviews/", response_model=schemas.Review)
-def create_review(review: schemas.ReviewCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    if str(review.user_id) != str(current_user.id):
+def create_review(review: schemas.ReviewCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
+    if review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to create review for this user")
     
-    if not db.query(models.Product).filter(models.Product.id == review.product_id).first():
+    product_exists = db.query(literal(True)).filter(
+        db.query(models.Product).filter(models.Product.id == review.product_id).exists()
+    ).scalar()
+    if not product_exists:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Check if user has purchased the product
-    has_purchased = db.query(models.OrderItem).join(models.Order).filter(
-        models.Order.user_id == current_user.id,
-        models.OrderItem.product_id == review.product_id
-    ).first()
+    # Check if user has purchased the product; a scalar EXISTS stops at the
+    # first matching row and hydrates nothing
+    has_purchased = db.query(literal(True)).filter(
+        db.query(models.OrderItem).join(models.Order).filter(
+            models.Order.user_id == current_user.id,
+            models.OrderItem.product_id == review.product_id
+        ).exists()
+    ).scalar()
     if not has_purchased:
         raise HTTPException(status_code=403, detail="You must purchase this product to review it")
 
     db_review = models.Review(**review.dict())
     db.add(db_review)
     db.commit()
-    db.refresh(db_review)
+    # No refresh: the INSERT's RETURNING already populated created_at
+    # and expire_on_commit=False keeps it after commit
+    # Cached products carry aggregated rating stats, so a new review stales them
+    product_cache.invalidate()
+    review_cache.invalidate(review.product_id)
+    background_tasks.add_task(refresh_review_stats)
     return db_review
 
 @app.delete("/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_review(review_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_review = db.query(models.Review).filter(models.Review.id == review_id).first()
+def delete_review(review_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    db_review = db.get(models.Review, review_id)
     if not db_review:
         raise HTTPException(status_code=404, detail="Review not found")
+    review_product_id = db_review.product_id
     db.delete(db_review)
     db.commit()
+    product_cache.invalidate()
+    review_cache.invalidate(review_product_id)
+    background_tasks.add_task(refresh_review_stats)
     return
 
+def refresh_review_stats():
+    # Runs after the response is sent; CONCURRENTLY keeps readers unblocked
+    # (it needs the view's unique index, created with the view) but refuses
+    # to run inside a transaction block, so use an autocommit connection
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY product_review_stats"))
+    except Exception:
+        # A failed refresh just leaves the rollup stale until the next
+        # review write; log it rather than let the task error surface
+        logger.exception("product_review_stats refresh failed")
+
+@app.get("/products/{product_id}/review_stats", response_model=schemas.ProductReviewStats)
+def read_product_review_stats(product_id: UUID, db: Session = Depends(get_db_ro)):
+    # Precomputed rollup: a single-row index lookup instead of aggregating
+    # the reviews table on every product page load
+    row = db.execute(
+        text("SELECT product_id, review_count, avg_rating FROM product_review_stats WHERE product_id = :pid"),
+        {"pid": product_id},
+    ).mappings().first()
+    if row is None:
+        # No reviews yet — the view simply has no row for this product
+        return schemas.ProductReviewStats(product_id=product_id, review_count=0)
+    return schemas.ProductReviewStats(**row)
+
 @app.get("/products/{product_id}/reviews/", response_model=List[schemas.Review])
-def read_product_reviews(product_id: UUID, db: Session = Depends(get_db)):
-    reviews = db.query(models.Review).filter(models.Review.product_id == product_id).all()
+def read_product_reviews(product_id: UUID, db: Session = Depends(get_db_ro)):
+    cached = review_cache.get(product_id)
+    if cached is not None:
+        return cached
+    reviews = db.execute(_REVIEWS_BY_PRODUCT, {"pid": product_id}).scalars().all()
+    review_cache.set(product_id, reviews)
     return reviews
 
 # Rescue Contribution Endpoints
 @app.get("/orders/{order_id}/rescue_contribution/", response_model=schemas.RescueContribution)
 def read_rescue_contribution(order_id: UUID, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
-    db_contribution = db.query(models.RescueContribution).filter(models.RescueContribution.order_id == order_id).first()
+    # One query: join in the order so the ownership check reads from memory
+    db_contribution = db.query(models.RescueContribution).options(
+        joinedload(models.RescueContribution.order)
+    ).filter(models.RescueContribution.order_id == order_id).first()
     if db_contribution is None:
         raise HTTPException(status_code=404, detail="Rescue contribution not found for this order")
     # Only allow admin or the user who placed the order to view
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if order and (str(order.user_id) == str(current_user.id) or current_user.role == "admin"):
+    if db_contribution.order.user_id == current_user.id or current_user.role == "admin":
         return db_contribution
     raise HTTPException(status_code=403, detail="Not authorized to view this rescue contribution")
 
 @app.get("/admin/rescue-contributions/", response_model=List[schemas.RescueContribution])
-def read_all_rescue_contributions(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+def read_all_rescue_contributions(skip: int = 0, limit: int = Query(100, ge=1, le=500), after: Optional[UUID] = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
+    # Admin-only dashboard data keyed by pagination window; invalidated on
+    # checkout and aged out after a minute either way
+    cache_key = (skip, limit, after)
+    cached = rescue_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Eager load the 'order' relationship to access order_number
-    contributions = db.query(models.RescueContribution).options(
+    query = db.query(models.RescueContribution).options(
         joinedload(models.RescueContribution.order)
-    ).offset(skip).limit(limit).all()
+    )
+    query = _keyset_page(query, models.RescueContribution, after, db)
+    if after is None:
+        query = query.offset(skip)
+    contributions = query.limit(limit).all()
     
     # Map the order_number from the relationship to the schema field
     for c in contributions:
         c.order_number = c.order.order_number if c.order else "N/A"
-        
+
+    rescue_cache.set(cache_key, contributions)
     return contributions
 
 @app.on_event("startup")
@@ -1147,7 +1474,7 @@ async def startup_event():
 
 # Service Endpoints
 @app.get("/services/", response_model=List[schemas.Service])
-def read_services(db: Session = Depends(get_db)):
+def read_services(db: Session = Depends(get_db_ro)):
     return db.query(models.Service).filter(models.Service.is_active == True).all()
 
 @app.post("/services/", response_model=schemas.Service)
@@ -1160,7 +1487,7 @@ def create_service(service: schemas.ServiceCreate, db: Session = Depends(get_db)
 
 # Booking Endpoints
 @app.post("/bookings/", response_model=schemas.Booking)
-def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
+def create_booking(booking: schemas.BookingCreate, background_tasks: BackgroundTasks = None, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_user)):
     service = db.query(models.Service).filter(models.Service.id == booking.service_id).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
@@ -1173,11 +1500,8 @@ def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)
     db.commit()
     db.refresh(db_booking)
 
-    # Notify admin via email
-    try:
-        email_service.send_admin_booking_notification(db_booking, current_user, service.name)
-    except Exception as e:
-        print(f"Failed to send booking notification email: {e}")
+    # Notify admin via email once the response is out the door
+    background_tasks.add_task(email_service.send_admin_booking_notification, db_booking, current_user, service.name)
 
     return db_booking
 
@@ -1191,7 +1515,7 @@ def read_all_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get
 
 @app.put("/admin/bookings/{booking_id}/status", response_model=schemas.Booking)
 def update_booking_status(booking_id: UUID, booking_update: schemas.BookingUpdate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_admin)):
-    db_booking = db.query(models.Booking).filter(models.Booking.id == booking_id).first()
+    db_booking = db.get(models.Booking, booking_id)
     if not db_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
         
@@ -1204,7 +1528,7 @@ def update_booking_status(booking_id: UUID, booking_update: schemas.BookingUpdat
     return db_booking
 
 @app.post("/auth/forgot-password")
-async def forgot_password(request: schemas.ForgotPasswordRequest, db: Session = Depends(get_db)):
+def forgot_password(request: schemas.ForgotPasswordRequest, background_tasks: BackgroundTasks = None, db: Session = Depends(get_db)):
     # Use lower() to prevent case-sensitivity issues during password reset
     user = db.query(models.User).filter(
         func.lower(models.User.email) == request.email.lower().strip()
@@ -1214,12 +1538,14 @@ async def forgot_password(request: schemas.ForgotPasswordRequest, db: Session =
         user.reset_token = token
         user.reset_token_expires = datetime.now(timezone.utc) + timedelta(hours=1)
         db.commit()
-        email_service.send_password_reset_email(user, token)
+        # Deferred past the response: keeps the endpoint fast and stops the
+        # provider round trip from leaking account existence via timing
+        background_tasks.add_task(email_service.send_password_reset_email, user, token)
     # Always return success to prevent email enumeration
     return {"message": "If an account exists with this email, a reset link has been sent."}
 
 @app.post("/auth/reset-password")
-async def reset_password(request: schemas.ResetPasswordRequest, db: Session = Depends(get_db)):
+def reset_password(request: schemas.ResetPasswordRequest, db: Session = Depends(get_db)):
     user = db.query(models.User).filter(
         models.User.reset_token == request.token,
         models.User.reset_token_expires > datetime.now()
@@ -1232,4 +1558,5 @@ async def reset_password(request: schemas.ResetPasswordRequest, db: Session = De
     user.reset_token = None
     user.reset_token_expires = None
     db.commit()
+    invalidate_user_cache(user.email)
     return {"message": "Password has been successfully reset."}
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Numeric, DateTime, Text, Enum, Table, Index, JSON
+from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Numeric, DateTime, Text, Enum, Table, Index, JSON, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
+
+from ..core.ids import uuid7
 from ..db.session import Base
 
 # Association Tables
@@ -29,17 +31,20 @@ class User(Base):
     reset_token = Column(String, unique=True, index=True)
     reset_token_expires = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    addresses = relationship("Address", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes on CASCADE-backed children: deleting a parent issues
+    # one DELETE and lets the database fan out, instead of the ORM loading
+    # every child row just to delete it
+    addresses = relationship("Address", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     orders = relationship("Order", back_populates="user")
     wishlist = relationship("Product", secondary="wishlists", back_populates="wishlisted_by")
     cart_items = relationship("CartItem", back_populates="user")
-    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     complaints = relationship("Complaint", back_populates="user", cascade="all, delete-orphan")
     returns = relationship("Return", back_populates="user", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="user", cascade="all, delete-orphan")
-    bookings = relationship("Booking", back_populates="user", cascade="all, delete-orphan")
+    bookings = relationship("Booking", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 class Address(Base):
     __tablename__ = "addresses"
@@ -89,16 +94,18 @@ class Product(Base):
     manufacturing_cost = Column(Numeric(10, 2), default=0)
     transport_cost = Column(Numeric(10, 2), default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     category = relationship("Category", back_populates="products")
-    specifications = relationship("ProductSpecification", back_populates="product", cascade="all, delete-orphan")
-    images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
+    # Serialized on every product read; selectin keeps lists at O(1) extra
+    # queries instead of one lazy SELECT per row
+    specifications = relationship("ProductSpecification", back_populates="product", cascade="all, delete-orphan", lazy="selectin", passive_deletes=True)
+    images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan", lazy="selectin", passive_deletes=True)
     wishlisted_by = relationship("User", secondary="wishlists", back_populates="wishlist")
     suppliers = relationship("Supplier", secondary=product_suppliers, back_populates="products")
     cart_items = relationship("CartItem", back_populates="product")
     order_items = relationship("OrderItem", back_populates="product")
-    reviews = relationship("Review", back_populates="product", cascade="all, delete-orphan")
+    reviews = relationship("Review", back_populates="product", cascade="all, delete-orphan", passive_deletes=True)
 
 class ProductSpecification(Base):
     __tablename__ = "product_specifications"
@@ -136,8 +143,15 @@ class CartItem(Base):
 
 class Order(Base):
     __tablename__ = "orders"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    order_number = Column(String, unique=True, nullable=False)
+    # eager_defaults makes the INSERT return server-generated columns (the
+    # sequence-based order_number) in the same round trip, so the number is
+    # usable right after flush without an extra SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    order_number = Column(
+        String, unique=True, nullable=False,
+        server_default=text("'ORD-' || lpad(upper(to_hex(nextval('order_number_seq'))), 6, '0')"),
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     shipping_address_id = Column(UUID(as_uuid=True), ForeignKey("addresses.id"))
     status = Column(String, default="pending")
@@ -151,12 +165,14 @@ class Order(Base):
     notes = Column(Text)
     tracking_number = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="orders")
-    shipping_address = relationship("Address")
-    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
-    status_history = relationship("OrderStatusHistory", back_populates="order", cascade="all, delete-orphan")
+    # The response schema embeds all three of these on every order read;
+    # joined for the scalar FK, selectin for the collections
+    shipping_address = relationship("Address", lazy="joined")
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin", passive_deletes=True)
+    status_history = relationship("OrderStatusHistory", back_populates="order", cascade="all, delete-orphan", lazy="selectin", passive_deletes=True)
     notifications = relationship("Notification", back_populates="order")
     complaints = relationship("Complaint", back_populates="order")
     returns = relationship("Return", back_populates="order")
@@ -164,7 +180,7 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_items"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
     product_name = Column(String, nullable=False)
@@ -179,7 +195,7 @@ class OrderItem(Base):
 
 class OrderStatusHistory(Base):
     __tablename__ = "order_status_history"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
     old_status = Column(String)
     new_status = Column(String, nullable=False)
@@ -190,7 +206,7 @@ class OrderStatusHistory(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id", ondelete="SET NULL"))
     type = Column(String, nullable=False)
@@ -220,7 +236,7 @@ class Supplier(Base):
 
 class SupplierOrder(Base):
     __tablename__ = "supplier_orders"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_number = Column(String, unique=True, nullable=False)
     supplier_id = Column(String, ForeignKey("suppliers.id"), nullable=False)
     customer_order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"))
@@ -237,11 +253,11 @@ class SupplierOrder(Base):
     received_at = Column(DateTime(timezone=True))
 
     supplier = relationship("Supplier", back_populates="supplier_orders")
-    items = relationship("SupplierOrderItem", back_populates="supplier_order", cascade="all, delete-orphan")
+    items = relationship("SupplierOrderItem", back_populates="supplier_order", cascade="all, delete-orphan", passive_deletes=True)
 
 class SupplierOrderItem(Base):
     __tablename__ = "supplier_order_items"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     supplier_order_id = Column(UUID(as_uuid=True), ForeignKey("supplier_orders.id", ondelete="CASCADE"), nullable=False)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
     product_name = Column(String, nullable=False)
@@ -253,7 +269,8 @@ class SupplierOrderItem(Base):
 
 class SupplierPayment(Base):
     __tablename__ = "supplier_payments"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __mapper_args__ = {"eager_defaults": True}
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     supplier_id = Column(String, ForeignKey("suppliers.id"), nullable=False)
     supplier_order_id = Column(UUID(as_uuid=True), ForeignKey("supplier_orders.id"))
     amount = Column(Numeric(10, 2), nullable=False)
@@ -266,6 +283,7 @@ class SupplierPayment(Base):
 
 class Complaint(Base):
     __tablename__ = "complaints"
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"))
@@ -274,13 +292,14 @@ class Complaint(Base):
     status = Column(String, default="open")
     resolution = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="complaints")
     order = relationship("Order", back_populates="complaints")
 
 class Return(Base):
     __tablename__ = "returns"
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -289,14 +308,15 @@ class Return(Base):
     refund_amount = Column(Numeric(10, 2))
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="returns")
     order = relationship("Order", back_populates="returns")
 
 class Review(Base):
     __tablename__ = "reviews"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __mapper_args__ = {"eager_defaults": True}
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     rating = Column(Integer, nullable=False)
@@ -309,7 +329,7 @@ class Review(Base):
 
 class RescueContribution(Base):
     __tablename__ = "rescue_contributions"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     currency = Column(String, default="CHF")
@@ -358,3 +378,11 @@ class Page(Base):
     slug = Column(String, primary_key=True)
     language = Column(String, primary_key=True, index=True, default="en")
     content = Column(JSON, nullable=False, default={})
+
+class StripeEvent(Base):
+    __tablename__ = "stripe_events"
+    # Stripe's own event id is the natural key; an ON CONFLICT DO NOTHING
+    # insert against it makes webhook processing idempotent across retries
+    id = Column(String, primary_key=True)
+    type = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,12 +1,32 @@
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
+from typing import Literal
+
 from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 from app.services.payment_service import PaymentService
 from app.dependencies import get_current_user, get_current_admin
+from app.db.session import get_db
+from app.models import models
+import orjson
 import stripe
 import os
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+# Looked up once at import instead of per webhook delivery
+_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+
+# Stripe events are a few KB; anything bigger is not a legitimate webhook
+# and gets rejected before we buffer the body
+_MAX_WEBHOOK_BODY = 1_000_000
+
+# Admin dashboards poll the balance; one ~200ms Stripe round trip every
+# few seconds is plenty, the rest serve from memory
+_balance_cache = TTLCache(maxsize=1, ttl=5)
+
 # ============================================
 # STEP 1: Create Payment Intent
 # (Like M-Pesa STK Push)
@@ -14,10 +34,12 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 
 class CreateIntentRequest(BaseModel):
     amount: float
-    payment_method: str  # "card" or "twint"
+    # Literal validates with one hash lookup and rejects typos before they
+    # turn into a Stripe API error round trip
+    payment_method: Literal["card", "twint"]
 
 @router.post("/create-intent")
-async def create_payment_intent(
+def create_payment_intent(
     request: CreateIntentRequest,
     current_user = Depends(get_current_user)
 ):
@@ -42,30 +64,51 @@ async def create_payment_intent(
 # ============================================
 
 @router.post("/webhook")
-async def stripe_webhook(request: Request):
+async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     """
     M-Pesa equivalent: Callback URL
     Stripe calls this when payment is completed
     """
+    if int(request.headers.get("content-length") or 0) > _MAX_WEBHOOK_BODY:
+        raise HTTPException(status_code=413, detail="Payload too large")
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
-    webhook_secret = os.getenv("STRIPE_WEBHOOK_SECRET")
 
     try:
         # Verify webhook is from Stripe
         # Like verifying M-Pesa callback signature
-        event = stripe.Webhook.construct_event(
-            payload, sig_header, webhook_secret
+        # (CPU-only HMAC over the raw bytes, fine on the event loop).
+        # Split from construct_event so unauthenticated payloads are
+        # rejected before any JSON parsing happens.
+        stripe.WebhookSignature.verify_header(
+            payload, sig_header, _WEBHOOK_SECRET, stripe.Webhook.DEFAULT_TOLERANCE
         )
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid payload")
     except stripe.error.SignatureVerificationError:
         raise HTTPException(status_code=400, detail="Invalid signature")
+    try:
+        event = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid payload")
 
     # ============================================
     # Handle Events (Like M-Pesa Result Codes)
     # ============================================
 
+    # Stripe retries deliveries, so claim the event id first: a single
+    # upsert round trip that returns nothing when we've seen it before
+    def _claim_event():
+        row = db.execute(
+            pg_insert(models.StripeEvent)
+            .values(id=event["id"], type=event["type"])
+            .on_conflict_do_nothing()
+            .returning(models.StripeEvent.id)
+        ).scalar()
+        db.commit()
+        return row
+
+    if await run_in_threadpool(_claim_event) is None:
+        return {"status": "duplicate"}
+
     # Payment succeeded (like M-Pesa ResultCode: 0)
     if event["type"] == "payment_intent.succeeded":
         payment_intent = event["data"]["object"]
@@ -84,12 +127,19 @@ async def stripe_webhook(request: Request):
     return {"status": "success"}
 
 @router.get("/admin/stripe-balance")
-async def get_stripe_balance(current_user = Depends(get_current_admin)):
+def get_stripe_balance(fresh: bool = False, current_user = Depends(get_current_admin)):
     """
-    Fetch the actual Stripe balance (Available & Pending)
+    Fetch the actual Stripe balance (Available & Pending).
+    Cached for a few seconds to absorb dashboard polling; pass ?fresh=1
+    to force a live fetch.
     """
+    if not fresh:
+        cached = _balance_cache.get("balance")
+        if cached is not None:
+            return cached
     try:
         balance = stripe.Balance.retrieve()
-        return balance
     except stripe.error.StripeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    _balance_cache["balance"] = balance
+    return balance
\ No newline at end of file
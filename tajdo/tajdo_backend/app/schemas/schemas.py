@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -27,8 +27,7 @@ class User(UserBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
@@ -51,8 +50,7 @@ class ProductSpecificationCreate(ProductSpecificationBase):
 class ProductSpecification(ProductSpecificationBase):
     id: UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ProductImage Schemas (Moved up for nested creation)
 class ProductImageBase(BaseModel):
@@ -67,8 +65,7 @@ class ProductImageCreate(ProductImageBase):
 class ProductImage(ProductImageBase):
     id: UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Product Schemas
 class ProductBase(BaseModel):
@@ -87,8 +84,8 @@ class ProductBase(BaseModel):
     shipping_days: int = 5
 
 class ProductCreate(ProductBase):
-    specifications: Optional[List[ProductSpecificationCreate]] = []
-    images: Optional[List[ProductImageCreate]] = []
+    specifications: Optional[List[ProductSpecificationCreate]] = Field(default_factory=list)
+    images: Optional[List[ProductImageCreate]] = Field(default_factory=list)
 
 class ProductUpdate(BaseModel):
     sku: Optional[str] = None
@@ -105,17 +102,35 @@ class ProductUpdate(BaseModel):
     in_stock: Optional[bool] = None
     shipping_days: Optional[int] = None
 
+class ProductListItem(BaseModel):
+    # Column-trimmed row for grid/search views: everything a product card
+    # shows, nothing a detail page needs
+    id: UUID
+    name: str
+    price: Decimal
+    original_price: Optional[Decimal] = None
+    image_url: Optional[str] = None
+    rating: Decimal
+    review_count: int
+    badge: Optional[str] = None
+    in_stock: Optional[bool] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# One adapter for whole result pages: validation and JSON dumping loop in
+# pydantic-core instead of per-item Python calls
+ProductListPage = TypeAdapter(List[ProductListItem])
+
 class Product(ProductBase):
     id: UUID
     rating: Decimal
     review_count: int
     created_at: datetime
     updated_at: datetime
-    specifications: List[ProductSpecification] = []
-    images: List[ProductImage] = []
+    specifications: List[ProductSpecification] = Field(default_factory=list)
+    images: List[ProductImage] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Category Schemas
 class CategoryBase(BaseModel):
@@ -137,8 +152,7 @@ class CategoryUpdate(BaseModel):
 class Category(CategoryBase):
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Address Schemas
 class AddressBase(BaseModel):
@@ -159,8 +173,7 @@ class Address(AddressBase):
     user_id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TwintTransactionSchema(BaseModel):
     id: UUID
@@ -171,8 +184,7 @@ class TwintTransactionSchema(BaseModel):
     payment_intent_id: Optional[str] = None
     status: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CardTransactionSchema(BaseModel):
     id: str
@@ -183,8 +195,7 @@ class CardTransactionSchema(BaseModel):
     payment_intent_id: Optional[str] = None
     status: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Wishlist Schemas
 class WishlistBase(BaseModel):
@@ -194,8 +205,7 @@ class Wishlist(WishlistBase):
     user_id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # CartItem Schemas
 class CartItemBase(BaseModel):
@@ -212,8 +222,7 @@ class CartItem(CartItemBase):
     user_id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Order Schemas
 class OrderItemBase(BaseModel):
@@ -229,14 +238,15 @@ class OrderItem(OrderItemBase):
     unit_price: Decimal
     total: Decimal
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CardDetails(BaseModel):
-    card_number: str
-    exp_month: int
-    exp_year: int
-    cvc: str
+    # Input-only schema: constrained so malformed card data is rejected by
+    # a single pattern check in pydantic-core instead of reaching handlers
+    card_number: str = Field(min_length=13, max_length=19, pattern=r"^\d+$")
+    exp_month: int = Field(ge=1, le=12)
+    exp_year: int = Field(ge=2000, le=2100)
+    cvc: str = Field(min_length=3, max_length=4, pattern=r"^\d+$")
     card_holder_name: Optional[str] = None
 
 # OrderStatusHistory Schemas (Moved up for nesting)
@@ -253,8 +263,7 @@ class OrderStatusHistory(OrderStatusHistoryBase):
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OrderBase(BaseModel):
     shipping_address_id: Optional[UUID] = None
@@ -287,10 +296,9 @@ class Order(OrderBase):
     items: List[OrderItem]
     user: Optional[User] = None
     shipping_address: Optional[Address] = None
-    status_history: List[OrderStatusHistory] = []
+    status_history: List[OrderStatusHistory] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Notification Schemas
 class NotificationBase(BaseModel):
@@ -308,8 +316,7 @@ class Notification(NotificationBase):
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Supplier Schemas
 class SupplierBase(BaseModel):
@@ -328,8 +335,7 @@ class SupplierCreate(SupplierBase):
 class Supplier(SupplierBase):
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # SupplierOrder Schemas
 class SupplierOrderBase(BaseModel):
@@ -354,8 +360,7 @@ class SupplierOrder(SupplierOrderBase):
     shipped_at: Optional[datetime] = None
     received_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # SupplierOrderItem Schemas
 class SupplierOrderItemBase(BaseModel):
@@ -371,8 +376,7 @@ class SupplierOrderItemCreate(SupplierOrderItemBase):
 class SupplierOrderItem(SupplierOrderItemBase):
     id: UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # SupplierPayment Schemas
 class SupplierPaymentBase(BaseModel):
@@ -390,8 +394,7 @@ class SupplierPayment(SupplierPaymentBase):
     id: UUID
     paid_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Complaint Schemas
 class ComplaintBase(BaseModel):
@@ -410,8 +413,7 @@ class Complaint(ComplaintBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Return Schemas
 class ReturnBase(BaseModel):
@@ -430,8 +432,7 @@ class Return(ReturnBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Review Schemas
 class ReviewBase(BaseModel):
@@ -448,8 +449,12 @@ class Review(ReviewBase):
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ProductReviewStats(BaseModel):
+    product_id: UUID
+    review_count: int
+    avg_rating: Optional[Decimal] = None
 
 # RescueContribution Schemas
 class RescueContributionBase(BaseModel):
@@ -465,8 +470,7 @@ class RescueContribution(RescueContributionBase):
     created_at: datetime
     order_number: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Service Schemas
 class ServiceBase(BaseModel):
@@ -492,8 +496,7 @@ class Service(ServiceBase):
     id: UUID
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Booking Schemas
 class BookingBase(BaseModel):
@@ -523,8 +526,7 @@ class Booking(BookingBase):
     created_at: datetime
     service: Optional[Service] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
@@ -544,5 +546,4 @@ class PageUpdate(BaseModel):
     content: Dict[str, Any]
 
 class Page(PageBase):
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
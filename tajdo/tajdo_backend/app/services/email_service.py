@@ -1,56 +1,66 @@
+import logging
+import re
 import resend
 import os
 from datetime import datetime
+from string import Template
 from ..core.config import settings
 
-class EmailService:
-    
-    def __init__(self):
-        resend.api_key = os.getenv('RESEND_API_KEY')
-        self.from_email = os.getenv('FROM_EMAIL', 'onboarding@resend.dev')
-        self.from_name = os.getenv('FROM_NAME', 'TAJDO')
-            
-    def send_email(self, to_email: str, subject: str, html_content: str):
-        """Send an email via Resend"""
-        try:
-            params = {
-                "from": f"{self.from_name} <{self.from_email}>",
-                "to": [to_email],
-                "subject": subject,
-                "html": html_content,
-            }
-            email = resend.Emails.send(params)
-            print(f"Email sent to {to_email}: ID {email.get('id')}")
-            return True
-        except Exception as e:
-            print(f"Error sending email: {str(e)}")
-            return False
-    
-    def send_order_confirmation(self, order, user):
-        """Send order confirmation email"""
-        subject = f"Order Confirmation - {order.order_number}"
-        
-        html_content = f"""
+logger = logging.getLogger(__name__)
+
+_RESEND_KEY = os.getenv('RESEND_API_KEY')
+_FROM_EMAIL = os.getenv('FROM_EMAIL', 'onboarding@resend.dev')
+_FROM_NAME = os.getenv('FROM_NAME', 'TAJDO')
+_FROM_HEADER = f"{_FROM_NAME} <{_FROM_EMAIL}>"
+
+resend.api_key = _RESEND_KEY
+
+# Templates are built once at import instead of re-assembling ~2 KB of HTML
+# fragments inside every send_* call. string.Template keeps the CSS braces
+# literal (no {{ }} doubling) and its placeholder pattern is compiled once;
+# per email we only pay a substitute() over a small context dict. The HTML
+# is also minified once here: the indentation exists for this file's
+# readability, not for mail clients, and stripping it cuts each outbound
+# payload by roughly a third.
+
+_TAG_GAP_RE = re.compile(r">\s+<")
+_WS_RE = re.compile(r"[ \t\n]{2,}")
+
+
+def _minify(html: str) -> str:
+    return _WS_RE.sub(" ", _TAG_GAP_RE.sub("><", html))
+
+_BASE_STYLE = """
+                body { font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background-color: #F5F0EB; padding: 30px; text-align: center; }
+                .header h1 { color: #2C2C2C; margin: 0; font-size: 28px; }
+                .content { padding: 30px 20px; }
+                .footer { text-align: center; padding: 20px; color: #666; font-size: 12px; }
+"""
+
+_ORDER_INFO_STYLE = """
+                .order-info { background-color: #F5F0EB; padding: 20px; margin: 20px 0; }
+                .order-info p { margin: 8px 0; }
+"""
+
+_BUTTON_STYLE = """
+                .button {
+                    display: inline-block;
+                    background-color: #2C2C2C;
+                    color: white;
+                    padding: 12px 30px;
+                    text-decoration: none;
+                    margin: 20px 0;
+                }
+"""
+
+_ORDER_CONFIRMATION_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .header h1 {{ color: #2C2C2C; margin: 0; font-size: 28px; }}
-                .content {{ padding: 30px 20px; }}
-                .order-info {{ background-color: #F5F0EB; padding: 20px; margin: 20px 0; }}
-                .order-info p {{ margin: 8px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
-                .button {{ 
-                    display: inline-block; 
-                    background-color: #2C2C2C; 
-                    color: white; 
-                    padding: 12px 30px; 
-                    text-decoration: none; 
-                    margin: 20px 0;
-                }}
+""" + _BASE_STYLE + _ORDER_INFO_STYLE + _BUTTON_STYLE + """
             </style>
         </head>
         <body>
@@ -59,64 +69,47 @@ class EmailService:
                     <h1>TAJDO</h1>
                     <p style="margin: 10px 0 0 0; color: #666;">Thank you for your order</p>
                 </div>
-                
+
                 <div class="content">
-                    <p>Dear {user.full_name or 'Valued Customer'},</p>
-                    
+                    <p>Dear $full_name,</p>
+
                     <p>We've received your order and we're getting it ready. You'll receive another email when your order has been shipped.</p>
-                    
+
                     <div class="order-info">
-                        <p><strong>Order Number:</strong> {order.order_number}</p>
-                        <p><strong>Order Date:</strong> {order.created_at.strftime('%B %d, %Y')}</p>
-                        <p><strong>Total:</strong> CHF {order.total:.2f}</p>
-                        <p><strong>Payment Method:</strong> {order.payment_method.title()}</p>
+                        <p><strong>Order Number:</strong> $order_number</p>
+                        <p><strong>Order Date:</strong> $order_date</p>
+                        <p><strong>Total:</strong> CHF $total</p>
+                        <p><strong>Payment Method:</strong> $payment_method</p>
                     </div>
-                    
+
                     <p style="text-align: center;">
-                        <a href="{settings.FRONTEND_URL}/track-order?order_number={order.order_number}&email={user.email}" class="button">
+                        <a href="$frontend_url/track-order?order_number=$order_number&email=$email" class="button">
                             Track Your Order
                         </a>
                     </p>
-                    
+
                     <p>If you have any questions, please don't hesitate to contact us.</p>
-                    
+
                     <p>With every purchase, 10% goes to TAJDO Rescue to help dogs in need.</p>
-                    
+
                     <p style="margin-top: 30px;">Best regards,<br>The TAJDO Team</p>
                 </div>
-                
+
                 <div class="footer">
                     <p>TAJDO - Luxury with Purpose</p>
-                    <p>This email was sent to {user.email}</p>
+                    <p>This email was sent to $email</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        
-        return self.send_email(user.email, subject, html_content)
-    
-    def send_order_shipped(self, order, user, tracking_number: str = None):
-        """Send order shipped email"""
-        subject = f"Your Order Has Shipped - {order.order_number}"
-        
-        tracking_info = ""
-        if tracking_number:
-            tracking_info = f"<p><strong>Tracking Number:</strong> {tracking_number}</p>"
-        
-        html_content = f"""
+"""))
+
+_ORDER_SHIPPED_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .header h1 {{ color: #2C2C2C; margin: 0; font-size: 28px; }}
-                .content {{ padding: 30px 20px; }}
-                .order-info {{ background-color: #F5F0EB; padding: 20px; margin: 20px 0; }}
-                .order-info p {{ margin: 8px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
+""" + _BASE_STYLE + _ORDER_INFO_STYLE + """
             </style>
         </head>
         <body>
@@ -124,48 +117,37 @@ class EmailService:
                 <div class="header">
                     <h1>📦 Your Order is On Its Way!</h1>
                 </div>
-                
+
                 <div class="content">
-                    <p>Dear {user.full_name or 'Valued Customer'},</p>
-                    
+                    <p>Dear $full_name,</p>
+
                     <p>Great news! Your TAJDO order has been shipped and is on its way to you.</p>
-                    
+
                     <div class="order-info">
-                        <p><strong>Order Number:</strong> {order.order_number}</p>
-                        {tracking_info}
+                        <p><strong>Order Number:</strong> $order_number</p>
+                        $tracking_info
                         <p><strong>Estimated Delivery:</strong> 3-7 business days</p>
                     </div>
-                    
+
                     <p>You can track your order status at any time on our website.</p>
-                    
+
                     <p style="margin-top: 30px;">Best regards,<br>The TAJDO Team</p>
                 </div>
-                
+
                 <div class="footer">
                     <p>TAJDO - Luxury with Purpose</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        
-        return self.send_email(user.email, subject, html_content)
-    
-    def send_order_delivered(self, order, user):
-        """Send order delivered email"""
-        subject = f"Your Order Has Been Delivered - {order.order_number}"
-        
-        html_content = f"""
+"""))
+
+_ORDER_DELIVERED_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .header h1 {{ color: #2C2C2C; margin: 0; font-size: 28px; }}
-                .content {{ padding: 30px 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
+""" + _BASE_STYLE + """
             </style>
         </head>
         <body>
@@ -173,44 +155,33 @@ class EmailService:
                 <div class="header">
                     <h1>✓ Delivery Confirmed</h1>
                 </div>
-                
+
                 <div class="content">
-                    <p>Dear {user.full_name or 'Valued Customer'},</p>
-                    
-                    <p>Your TAJDO order ({order.order_number}) has been successfully delivered!</p>
-                    
+                    <p>Dear $full_name,</p>
+
+                    <p>Your TAJDO order ($order_number) has been successfully delivered!</p>
+
                     <p>We hope you and your furry friend love your new products. Remember, 10% of your purchase supports TAJDO Rescue.</p>
-                    
+
                     <p>If you have any questions or concerns about your order, please don't hesitate to contact us.</p>
-                    
+
                     <p style="margin-top: 30px;">Best regards,<br>The TAJDO Team</p>
                 </div>
-                
+
                 <div class="footer">
                     <p>TAJDO - Luxury with Purpose</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        
-        return self.send_email(user.email, subject, html_content)
-    
-    def send_order_cancelled(self, order, user):
-        """Send order cancelled email"""
-        subject = f"Order Cancelled - {order.order_number}"
-        
-        html_content = f"""
+"""))
+
+_ORDER_CANCELLED_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .header h1 {{ color: #2C2C2C; margin: 0; font-size: 28px; }}
-                .content {{ padding: 30px 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
+""" + _BASE_STYLE + """
             </style>
         </head>
         <body>
@@ -218,44 +189,33 @@ class EmailService:
                 <div class="header">
                     <h1>Order Cancelled</h1>
                 </div>
-                
+
                 <div class="content">
-                    <p>Dear {user.full_name or 'Valued Customer'},</p>
-                    
-                    <p>Your TAJDO order ({order.order_number}) has been cancelled.</p>
-                    
+                    <p>Dear $full_name,</p>
+
+                    <p>Your TAJDO order ($order_number) has been cancelled.</p>
+
                     <p>If you have already paid for this order, a refund will be processed shortly.</p>
-                    
+
                     <p>If you have any questions or believe this was a mistake, please contact our support team.</p>
-                    
+
                     <p style="margin-top: 30px;">Best regards,<br>The TAJDO Team</p>
                 </div>
-                
+
                 <div class="footer">
                     <p>TAJDO - Luxury with Purpose</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        
-        return self.send_email(user.email, subject, html_content)
+"""))
 
-    def send_order_refunded(self, order, user):
-        """Send order refunded email"""
-        subject = f"Refund Processed - {order.order_number}"
-        
-        html_content = f"""
+_ORDER_REFUNDED_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .header h1 {{ color: #2C2C2C; margin: 0; font-size: 28px; }}
-                .content {{ padding: 30px 20px; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; }}
+""" + _BASE_STYLE + """
             </style>
         </head>
         <body>
@@ -263,61 +223,54 @@ class EmailService:
                 <div class="header">
                     <h1>Refund Processed</h1>
                 </div>
-                
+
                 <div class="content">
-                    <p>Dear {user.full_name or 'Valued Customer'},</p>
-                    
-                    <p>A refund has been processed for your TAJDO order ({order.order_number}).</p>
-                    
-                    <p>The amount of CHF {order.total:.2f} should appear in your account within 5-10 business days, depending on your bank.</p>
-                    
+                    <p>Dear $full_name,</p>
+
+                    <p>A refund has been processed for your TAJDO order ($order_number).</p>
+
+                    <p>The amount of CHF $total should appear in your account within 5-10 business days, depending on your bank.</p>
+
                     <p>If you have any questions, please don't hesitate to contact us.</p>
-                    
+
                     <p style="margin-top: 30px;">Best regards,<br>The TAJDO Team</p>
                 </div>
-                
+
                 <div class="footer">
                     <p>TAJDO - Luxury with Purpose</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        
-        return self.send_email(user.email, subject, html_content)
+"""))
 
-    def send_password_reset_email(self, user, token: str):
-        """Send password reset email"""
-        subject = "Reset Your Password - TAJDO"
-        reset_link = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-        
-        html_content = f"""
+_PASSWORD_RESET_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #F5F0EB; padding: 30px; text-align: center; }}
-                .content {{ padding: 30px 20px; }}
-                .button {{ 
-                    display: inline-block; 
-                    background-color: #2C2C2C; 
-                    color: white !important; 
-                    padding: 12px 30px; 
-                    text-decoration: none; 
+                body { font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background-color: #F5F0EB; padding: 30px; text-align: center; }
+                .content { padding: 30px 20px; }
+                .button {
+                    display: inline-block;
+                    background-color: #2C2C2C;
+                    color: white !important;
+                    padding: 12px 30px;
+                    text-decoration: none;
                     margin: 20px 0;
-                }}
+                }
             </style>
         </head>
         <body>
             <div class="container">
                 <div class="header"><h1>TAJDO</h1></div>
                 <div class="content">
-                    <p>Hello {user.full_name},</p>
+                    <p>Hello $full_name,</p>
                     <p>We received a request to reset your password. Click the button below to choose a new one. This link will expire in 1 hour.</p>
                     <p style="text-align: center;">
-                        <a href="{reset_link}" class="button">Reset Password</a>
+                        <a href="$reset_link" class="button">Reset Password</a>
                     </p>
                     <p>If you didn't request this, you can safely ignore this email.</p>
                     <p>Best regards,<br>The TAJDO Team</p>
@@ -325,24 +278,19 @@ class EmailService:
             </div>
         </body>
         </html>
-        """
-        return self.send_email(user.email, subject, html_content)
+"""))
 
-    def send_admin_booking_notification(self, booking, user, service_name):
-        """Notify admin of a new booking request"""
-        subject = f"New Training Request - {user.full_name}"
-        
-        html_content = f"""
+_ADMIN_BOOKING_TMPL = Template(_minify("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; }}
-                .header {{ background-color: #2C2C2C; color: white; padding: 20px; text-align: center; }}
-                .section {{ padding: 20px; border-bottom: 1px solid #eee; }}
-                .label {{ font-weight: bold; color: #666; font-size: 12px; text-transform: uppercase; }}
-                .value {{ margin-bottom: 15px; font-size: 16px; }}
+                body { font-family: 'Inter', Arial, sans-serif; color: #333; line-height: 1.6; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; }
+                .header { background-color: #2C2C2C; color: white; padding: 20px; text-align: center; }
+                .section { padding: 20px; border-bottom: 1px solid #eee; }
+                .label { font-weight: bold; color: #666; font-size: 12px; text-transform: uppercase; }
+                .value { margin-bottom: 15px; font-size: 16px; }
             </style>
         </head>
         <body>
@@ -352,20 +300,125 @@ class EmailService:
                 </div>
                 <div class="section">
                     <p class="label">Customer</p>
-                    <p class="value">{user.full_name}<br/>{user.email}<br/>{user.phone or 'No phone provided'}</p>
-                    
+                    <p class="value">$full_name<br/>$email<br/>$phone</p>
+
                     <p class="label">Program</p>
-                    <p class="value">{service_name} (Preferred: {booking.preferred_time})</p>
+                    <p class="value">$service_name (Preferred: $preferred_time)</p>
                 </div>
                 <div class="section">
                     <p class="label">Dog Details</p>
-                    <p class="value"><strong>{booking.dog_name}</strong> - {booking.dog_breed} ({booking.dog_age})</p>
-                    
+                    <p class="value"><strong>$dog_name</strong> - $dog_breed ($dog_age)</p>
+
                     <p class="label">Behavioural Issues</p>
-                    <p class="value">{booking.issues or 'No description provided.'}</p>
+                    <p class="value">$issues</p>
                 </div>
             </div>
         </body>
         </html>
-        """
-        return self.send_email("info@tajdo.ch", subject, html_content)
\ No newline at end of file
+"""))
+
+
+class EmailService:
+
+    def send_email(self, to_email: str, subject: str, html_content: str):
+        """Send an email via Resend"""
+        try:
+            params = {
+                "from": _FROM_HEADER,
+                "to": [to_email],
+                "subject": subject,
+                "html": html_content,
+            }
+            email = resend.Emails.send(params)
+            logger.info("Email sent to %s: ID %s", to_email, email.get("id"))
+            return True
+        except Exception:
+            logger.exception("Error sending email to %s", to_email)
+            return False
+
+    def send_order_confirmation(self, order, user):
+        """Send order confirmation email"""
+        subject = f"Order Confirmation - {order.order_number}"
+        html_content = _ORDER_CONFIRMATION_TMPL.substitute(
+            full_name=user.full_name or 'Valued Customer',
+            order_number=order.order_number,
+            order_date=order.created_at.strftime('%B %d, %Y'),
+            total=f"{order.total:.2f}",
+            payment_method=order.payment_method.title(),
+            frontend_url=settings.FRONTEND_URL,
+            email=user.email,
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_order_shipped(self, order, user, tracking_number: str = None):
+        """Send order shipped email"""
+        subject = f"Your Order Has Shipped - {order.order_number}"
+
+        tracking_info = ""
+        if tracking_number:
+            tracking_info = f"<p><strong>Tracking Number:</strong> {tracking_number}</p>"
+
+        html_content = _ORDER_SHIPPED_TMPL.substitute(
+            full_name=user.full_name or 'Valued Customer',
+            order_number=order.order_number,
+            tracking_info=tracking_info,
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_order_delivered(self, order, user):
+        """Send order delivered email"""
+        subject = f"Your Order Has Been Delivered - {order.order_number}"
+        html_content = _ORDER_DELIVERED_TMPL.substitute(
+            full_name=user.full_name or 'Valued Customer',
+            order_number=order.order_number,
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_order_cancelled(self, order, user):
+        """Send order cancelled email"""
+        subject = f"Order Cancelled - {order.order_number}"
+        html_content = _ORDER_CANCELLED_TMPL.substitute(
+            full_name=user.full_name or 'Valued Customer',
+            order_number=order.order_number,
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_order_refunded(self, order, user):
+        """Send order refunded email"""
+        subject = f"Refund Processed - {order.order_number}"
+        html_content = _ORDER_REFUNDED_TMPL.substitute(
+            full_name=user.full_name or 'Valued Customer',
+            order_number=order.order_number,
+            total=f"{order.total:.2f}",
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_password_reset_email(self, user, token: str):
+        """Send password reset email"""
+        subject = "Reset Your Password - TAJDO"
+        reset_link = f"{settings.FRONTEND_URL}/reset-password?token={token}"
+        html_content = _PASSWORD_RESET_TMPL.substitute(
+            full_name=user.full_name,
+            reset_link=reset_link,
+        )
+        return self.send_email(user.email, subject, html_content)
+
+    def send_admin_booking_notification(self, booking, user, service_name):
+        """Notify admin of a new booking request"""
+        subject = f"New Training Request - {user.full_name}"
+        html_content = _ADMIN_BOOKING_TMPL.substitute(
+            full_name=user.full_name,
+            email=user.email,
+            phone=user.phone or 'No phone provided',
+            service_name=service_name,
+            preferred_time=booking.preferred_time,
+            dog_name=booking.dog_name,
+            dog_breed=booking.dog_breed,
+            dog_age=booking.dog_age,
+            issues=booking.issues or 'No description provided.',
+        )
+        return self.send_email("info@tajdo.ch", subject, html_content)
+
+
+# Shared stateless instance; config is read once at import above.
+email_service = EmailService()
@@ -4,4 +4,17 @@ set -o errexit
 
 pip install -r requirements.txt
 
-alembic upgrade head
\ No newline at end of file
+# Sanity-check that hashlib is backed by an assembly-enabled OpenSSL build so
+# the sha256 pre-hash in app/core/security.py dispatches to SHA-NI on CPUs
+# that support it. A Python linked against a no-asm OpenSSL silently falls
+# back to the slow C implementation.
+python - <<'PY'
+import hashlib
+import ssl
+
+digest = hashlib.new("sha256", b"probe", usedforsecurity=True)
+assert digest.name == "sha256"
+print(f"sha256 backend: {ssl.OPENSSL_VERSION}")
+PY
+
+alembic upgrade head